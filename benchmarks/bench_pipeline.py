@@ -0,0 +1,212 @@
+"""Measure each config in `sonatoki.Configs` on each corpus in `corpora`,
+writing the results as JSON which can be compared across commits.
+
+    python benchmarks/bench_pipeline.py --output before.json
+    git checkout my-branch
+    python benchmarks/bench_pipeline.py --output after.json --compare before.json
+"""
+
+# STL
+import sys
+import json
+import time
+import argparse
+import platform
+import subprocess
+from typing import Any, Dict, List, Callable, Optional
+from datetime import datetime, timezone
+
+# LOCAL
+from sonatoki import Configs
+from sonatoki.ilo import Ilo
+
+# FILESYSTEM
+from corpora import CORPORA, CORPUS_VERSION, make_corpus
+
+CONFIGS = sorted(
+    name
+    for name, value in vars(Configs).items()
+    if name.endswith("Config") and isinstance(value, dict)
+)
+
+STAGES = ["preprocess", "sent_tokenize", "word_tokenize", "filter", "clean", "score"]
+
+# a ratio of messages/s below this, compared to a baseline, is a regression
+REGRESSION = 0.9
+
+
+def time_stages(ilo: Ilo, messages: List[str]) -> Dict[str, float]:
+    """Run each stage of the pipeline separately, in the order `Ilo` runs
+    them, returning the total seconds spent in each.
+
+    `Ilo` itself does filtering, cleaning and scoring in one pass over
+    each token, so these add up to somewhat more than a real run.
+    """
+    totals = dict.fromkeys(STAGES, 0.0)
+    clock = time.perf_counter
+    for message in messages:
+        t0 = clock()
+        processed = ilo.preprocess(message)
+        t1 = clock()
+        sentences = ilo.sent_tokenize(processed)
+        t2 = clock()
+        tokenized = [ilo.word_tokenize(sentence) for sentence in sentences]
+        t3 = clock()
+        filtered = [ilo.filter_tokens(tokens) for tokens in tokenized]
+        t4 = clock()
+        cleaned = [ilo.clean_tokens(tokens) for tokens in filtered]
+        t5 = clock()
+        _ = [ilo.score_tokens(tokens) for tokens in cleaned]
+        t6 = clock()
+
+        totals["preprocess"] += t1 - t0
+        totals["sent_tokenize"] += t2 - t1
+        totals["word_tokenize"] += t3 - t2
+        totals["filter"] += t4 - t3
+        totals["clean"] += t5 - t4
+        totals["score"] += t6 - t5
+    return totals
+
+
+def time_run(run: Callable[[], object], ilo: Ilo, cold: bool, repeat: int) -> float:
+    """Best of `repeat` runs, emptying every cache before each run if
+    `cold`, or warming them with one untimed run first otherwise."""
+    if not cold:
+        run()
+
+    best = float("inf")
+    for _ in range(repeat):
+        if cold:
+            ilo.clear_caches()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench(config: str, corpus: str, messages: List[str], repeat: int) -> List[Any]:
+    ilo = Ilo(**getattr(Configs, config))
+    # "cold" means empty caches, not also compiling every lazy pattern
+    ilo.make_scorecards_many(messages)
+    results: List[Any] = []
+    for cold in (True, False):
+        is_toki_pona = time_run(
+            lambda: ilo.is_toki_pona_many(messages), ilo, cold, repeat
+        )
+        are_toki_pona = time_run(
+            lambda: ilo.make_scorecards_many(messages), ilo, cold, repeat
+        )
+
+        if cold:
+            ilo.clear_caches()
+        else:
+            time_stages(ilo, messages)
+        stages = time_stages(ilo, messages)
+
+        results.append(
+            {
+                "config": config,
+                "corpus": corpus,
+                "cache": "cold" if cold else "warm",
+                "messages": len(messages),
+                "chars": sum(len(m) for m in messages),
+                "is_toki_pona_many": {
+                    "seconds": is_toki_pona,
+                    "messages_per_s": len(messages) / is_toki_pona,
+                },
+                "make_scorecards_many": {
+                    "seconds": are_toki_pona,
+                    "messages_per_s": len(messages) / are_toki_pona,
+                },
+                "stages": stages,
+            }
+        )
+    return results
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def compare(results: List[Any], baseline: Dict[str, Any]) -> int:
+    """Print each result's speed relative to the same result in `baseline`,
+    returning how many are regressions."""
+    if baseline["meta"]["corpus_version"] != CORPUS_VERSION:
+        print("baseline was measured on other corpora; not comparing", file=sys.stderr)
+        return 0
+
+    old = {(r["config"], r["corpus"], r["cache"]): r for r in baseline["results"]}
+    regressions = 0
+    for result in results:
+        key = (result["config"], result["corpus"], result["cache"])
+        if key not in old:
+            continue
+        ratio = (
+            result["is_toki_pona_many"]["messages_per_s"]
+            / old[key]["is_toki_pona_many"]["messages_per_s"]
+        )
+        flag = ""
+        if ratio < REGRESSION:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{' '.join(key):<42} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--configs", nargs="+", choices=CONFIGS, default=CONFIGS)
+    parser.add_argument(
+        "--corpora", nargs="+", choices=sorted(CORPORA), default=sorted(CORPORA)
+    )
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="file to write JSON results to")
+    parser.add_argument("--compare", help="JSON results to compare against")
+    argv = parser.parse_args()
+
+    results: List[Any] = []
+    for corpus in argv.corpora:
+        messages = make_corpus(corpus, argv.messages, argv.seed)
+        for config in argv.configs:
+            for result in bench(config, corpus, messages, argv.repeat):
+                results.append(result)
+                print(
+                    f"{config:<18} {corpus:<15} {result['cache']:<5} "
+                    f"{result['is_toki_pona_many']['messages_per_s']:10.0f} messages/s",
+                    file=sys.stderr,
+                )
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "date": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus_version": CORPUS_VERSION,
+            "messages": argv.messages,
+            "seed": argv.seed,
+            "repeat": argv.repeat,
+        },
+        "results": results,
+    }
+    if argv.output:
+        with open(argv.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if argv.compare:
+        with open(argv.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# STL
+import random
+import timeit
+from typing import List, Type
+
+# LOCAL
+from sonatoki.Filters import (
+    Filter,
+    Syllabic,
+    SyllabicRe,
+    Phonotactic,
+    PhonotacticRe,
+)
+from sonatoki.constants import linku_data
+
+ENGLISH = """the quick brown fox jumps over the lazy dog while a sleepy cat
+watches from the window and wonders whether anyone will ever feed it
+again today or if it must hunt for its own supper like its ancestors""".split()
+
+
+def make_tokens(n: int, seed: int = 0) -> List[str]:
+    """Half Toki Pona words, half English, with enough random suffixes that
+    few tokens repeat; these filters are only slow on cache misses."""
+    rng = random.Random(seed)
+    words = [entry["word"] for entry in linku_data()] + ENGLISH
+    suffixes = ["", "a", "ni", "n", "ko", "x", "wu", "nm"]
+    return [rng.choice(words) + rng.choice(suffixes) for _ in range(n)]
+
+
+def bench(filter: Type[Filter], tokens: List[str], repeat: int = 5) -> float:
+    # skip the filter's cache, so every call does the actual matching
+    uncached = filter.filter.__wrapped__  # type: ignore [attr-defined]
+
+    def run():
+        for token in tokens:
+            uncached(filter, token)
+
+    return min(timeit.repeat(run, number=1, repeat=repeat)) / len(tokens)
+
+
+def main():
+    tokens = make_tokens(100_000)
+    for automaton, reference in [(Syllabic, SyllabicRe), (Phonotactic, PhonotacticRe)]:
+        fast = bench(automaton, tokens)
+        slow = bench(reference, tokens)
+        print(
+            f"{automaton.__name__:>12}: {fast * 1e9:6.0f} ns/token  "
+            f"{reference.__name__:>14}: {slow * 1e9:6.0f} ns/token  "
+            f"({slow / fast:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
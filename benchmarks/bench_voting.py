@@ -0,0 +1,60 @@
+# STL
+import random
+import timeit
+from typing import List, Type, Tuple
+
+# LOCAL
+from sonatoki.Filters import (
+    Filter,
+    Syllabic,
+    Alphabetic,
+    NimiLinkuCore,
+    NimiLinkuCommon,
+)
+from sonatoki.Scorers import Scorer, Voting, VotingRef
+
+# FILESYSTEM
+from corpora import ENGLISH, TOKI_PONA
+
+FILTERS: List[Type[Filter]] = [NimiLinkuCore, NimiLinkuCommon, Syllabic, Alphabetic]
+
+
+def make_document(n: int, seed: int = 0) -> Tuple[List[str], List[int]]:
+    """A long document, mostly Toki Pona with English mixed in, as tokens and
+    the index of the first filter matching each."""
+    rng = random.Random(seed)
+    tokens = [
+        rng.choice(TOKI_PONA if rng.random() < 0.7 else ENGLISH) for _ in range(n)
+    ]
+    indices = [
+        next((i for i, f in enumerate(FILTERS) if f.filter(t)), -1) for t in tokens
+    ]
+    return tokens, indices
+
+
+def bench(scorer: Type[Scorer], tokens: List[str], indices: List[int]) -> float:
+    def run():
+        scorer.score_indices(tokens, indices, FILTERS)
+
+    number = max(1, 100_000 // len(tokens))
+    return min(timeit.repeat(run, number=number, repeat=5)) / number
+
+
+def main():
+    for n in [10, 100, 1_000, 10_000, 100_000]:
+        tokens, indices = make_document(n)
+        assert Voting.score_indices(
+            tokens, indices, FILTERS
+        ) == VotingRef.score_indices(tokens, indices, FILTERS)
+
+        fast = bench(Voting, tokens, indices)
+        slow = bench(VotingRef, tokens, indices)
+        print(
+            f"{n:>7} tokens: {fast * 1e6:9.1f} us  "
+            f"{VotingRef.__name__}: {slow * 1e6:9.1f} us  "
+            f"({slow / fast:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
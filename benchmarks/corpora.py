@@ -0,0 +1,125 @@
+# STL
+import random
+from typing import Dict, List, Callable
+
+# LOCAL
+from sonatoki.constants import NIMI_UCSUR, UCSUR_CARTOUCHE_LEFT, UCSUR_CARTOUCHE_RIGHT
+
+# bump whenever a generator changes, so results from different corpora are
+# never compared as if they were the same
+CORPUS_VERSION = 1
+
+# pinned here rather than read from the lexicon, which changes with Linku
+TOKI_PONA = """a akesi ala alasa ale anpa ante anu awen e en esun ijo ike ilo insa jaki
+jan jelo jo kala kalama kama kasi ken kepeken kijetesantakalu kili kin kipisi
+kiwen ko kon ku kule kulupu kute la lape laso lawa leko len lete li lili linja
+lipu loje lon luka lukin lupa ma mama mani meli mi mije misikeke moku moli monsi
+monsuta mu mun musi mute n namako nanpa nasa nasin nena ni nimi noka o olin ona
+open pakala pali palisa pan pana pi pilin pimeja pini pipi poka poki pona pu
+sama seli selo seme sewi sijelo sike sin sina sinpin sitelen soko sona soweli
+suli suno supa suwi tan taso tawa telo tenpo toki tomo tonsi tu unpa uta utala
+walo wan waso wawa weka wile""".split()
+
+ENGLISH = """the of and to a in is you that it he was for on are as with his they
+at be this have from or one had by word but not what all were we when your can
+said there use an each which she do how their if will up other about out many
+then them these so some her would make like him into time has look two more
+write go see number no way could people my than first water been call who oil
+its now find long down day did get come made may part over new sound take only
+little work know place year live me back give most very after thing our just
+name good sentence man think say great where help through much before line
+right too mean old any same tell boy follow came want show also around form
+three small set put end does another well large must big even such because turn
+here why ask went men read need land different home us move try kind hand
+picture again change off play spell air away animal house point page letter
+mother answer found study still learn should america world honestly literally
+""".split()
+
+INTERJECTIONS = ["lol", "lmao", "ok", "thanks", "wow", "haha", "omg", "yes", "no"]
+PUNCT = [".", ".", ".", "!", "?", "...", ":", ","]
+NAMES = ["Sonja", "Kekan", "Lipamanka", "Tokiponido", "Ma Kanata", "Nijon"]
+EXTRAS = [
+    "🙂",
+    "😭😭",
+    "<@123456789012>",
+    ":pona:",
+    "https://lipu-linku.github.io/",
+    "[lipu](https://sona.pona.la)",
+    "`code`",
+    "||len||",
+]
+
+Corpus = Callable[[random.Random, int], List[str]]
+
+
+def _sentence(rng: random.Random, words: List[str], low: int, high: int) -> str:
+    sentence = " ".join(rng.choice(words) for _ in range(rng.randint(low, high)))
+    if rng.random() < 0.2:
+        sentence = f"jan {rng.choice(NAMES)} li {sentence}"
+    return sentence + rng.choice(PUNCT)
+
+
+def short_chat(rng: random.Random, n: int) -> List[str]:
+    """One or two short sentences, as in a chat room, with the emoji, mentions,
+    links and markup that preprocessors exist for."""
+    messages: List[str] = []
+    for _ in range(n):
+        message = _sentence(rng, TOKI_PONA, 1, 8)
+        if rng.random() < 0.3:
+            message += " " + _sentence(rng, TOKI_PONA, 1, 6)
+        if rng.random() < 0.3:
+            message += " " + rng.choice(EXTRAS)
+        if rng.random() < 0.1:
+            message = rng.choice(INTERJECTIONS) + " " + message
+        messages.append(message)
+    return messages
+
+
+def long_prose(rng: random.Random, n: int) -> List[str]:
+    """Paragraphs of many sentences, as in a forum post or story."""
+    return [
+        " ".join(_sentence(rng, TOKI_PONA, 4, 15) for _ in range(rng.randint(5, 20)))
+        for _ in range(n)
+    ]
+
+
+def ucsur_heavy(rng: random.Random, n: int) -> List[str]:
+    """Sentences written in UCSUR glyphs, with some names in cartouches."""
+    glyphs = sorted(NIMI_UCSUR)
+    messages: List[str] = []
+    for _ in range(n):
+        sentences: List[str] = []
+        for _ in range(rng.randint(1, 4)):
+            sentence = "".join(rng.choice(glyphs) for _ in range(rng.randint(2, 12)))
+            if rng.random() < 0.3:
+                name = "".join(rng.choice(glyphs) for _ in range(rng.randint(2, 4)))
+                sentence += UCSUR_CARTOUCHE_LEFT + name + UCSUR_CARTOUCHE_RIGHT
+            sentences.append(sentence)
+        messages.append(" ".join(sentences))
+    return messages
+
+
+def mixed_language(rng: random.Random, n: int) -> List[str]:
+    """Messages alternating between Toki Pona and English sentences."""
+    messages: List[str] = []
+    for _ in range(n):
+        sentences = [
+            _sentence(rng, rng.choice([TOKI_PONA, ENGLISH]), 2, 12)
+            for _ in range(rng.randint(1, 6))
+        ]
+        messages.append(" ".join(sentences))
+    return messages
+
+
+CORPORA: Dict[str, Corpus] = {
+    "short_chat": short_chat,
+    "long_prose": long_prose,
+    "ucsur_heavy": ucsur_heavy,
+    "mixed_language": mixed_language,
+}
+
+
+def make_corpus(name: str, n: int, seed: int = 0) -> List[str]:
+    """Generate `n` messages for the named corpus; the same arguments always
+    give the same messages for a given `CORPUS_VERSION`."""
+    return CORPORA[name](random.Random(f"{name}-{seed}"), n)
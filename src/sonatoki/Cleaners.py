@@ -2,6 +2,7 @@
 import re
 from abc import ABC, abstractmethod
 from sys import intern
+from typing import List, Type, Callable, Optional
 
 # PDM
 from typing_extensions import override
@@ -71,6 +72,33 @@ class Lowercase(Cleaner):
         return intern(token.lower())
 
 
+def compile_cleaners(
+    cleaners: List[Type[Cleaner]],
+    wrap: Optional[Callable[[type, Callable[[str], str]], Callable[[str], str]]] = None,
+) -> Callable[[str], str]:
+    """Compile a list of cleaners into one function which applies them in
+    order.
+
+    If given, `wrap` is called with each cleaner and its `clean`, and
+    what it returns is called in place of `clean`.
+    """
+    cleans = [c.clean for c in cleaners]
+    if wrap is not None:
+        cleans = [wrap(c, clean) for c, clean in zip(cleaners, cleans)]
+
+    if not cleans:
+        return lambda token: token
+    if len(cleans) == 1:
+        return cleans[0]
+
+    def clean(token: str) -> str:
+        for c in cleans:
+            token = c(token)
+        return token
+
+    return clean
+
+
 __all__ = [
     "ConsecutiveDuplicates",
     "Lowercase",
@@ -34,6 +34,7 @@ from sonatoki.Filters import (
 )
 from sonatoki.Scorers import Scorer, Soften, Voting, PassFail, SoftScaling, SoftPassFail
 from sonatoki.Cleaners import Cleaner, ConsecutiveDuplicates
+from sonatoki.constants import drop_linku_index
 from sonatoki.Tokenizers import Tokenizer, WordTokenizerRe
 from sonatoki.Preprocessors import (
     RECOMMENDED_PREPROCESSORS,
@@ -176,6 +177,9 @@ IsipinEpikuConfig: IloConfig = {
     "empty_passes": True,
 }
 
+# every Linku filter above has copied the words it needs
+drop_linku_index()
+
 
 __all__ = [
     "BaseConfig",
@@ -1,17 +1,27 @@
 # STL
 import re
-from abc import ABC, abstractmethod
+import sys
+from abc import abstractmethod
 from copy import deepcopy
-from typing import Set, List, Type, Union, Literal, Optional
-from functools import lru_cache as cache  # cache comes in 3.9
+from typing import Any, Set, Dict, List, Type, Tuple, Union, Literal, Callable, Optional
+from weakref import WeakSet
+from functools import lru_cache
 
 # PDM
-import regex
 from typing_extensions import override, deprecated
 
 # LOCAL
+from sonatoki import constants
 from sonatoki.types import LinkuBooks, LinkuUsageDate, LinkuUsageCategory
-from sonatoki.utils import prep_dictionary
+from sonatoki.utils import (
+    Lazy,
+    FactoryMeta,
+    made_by,
+    compile_regex1,
+    compile_pattern,
+    prep_dictionary,
+    compile_automaton,
+)
 from sonatoki.constants import (
     VOWELS,
     ALPHABET,
@@ -22,7 +32,6 @@ from sonatoki.constants import (
     NIMI_PU_SYNONYMS,
     FALSE_POS_SYLLABIC,
     NOT_IN_PUNCT_CLASS,
-    ALL_PUNCT_RANGES_STR,
     FALSE_POS_ALPHABETIC,
     UCSUR_PUNCT_RANGES_STR,
     EMOJI_VARIATION_SELECTOR_RANGES_STR,
@@ -30,13 +39,83 @@ from sonatoki.constants import (
     words_by_usage,
 )
 
-regex.DEFAULT_VERSION = regex.VERSION1
+FILTER_CACHE_SIZE: Optional[int] = 2**14
+"""How many tokens each filter's cache remembers its verdict for. When a cache
+is full, its least recently used verdict is evicted.
+
+Change this with `set_filter_cache_size`.
+"""
+_filter_cache_registry: "WeakSet[Callable[..., bool]]" = WeakSet()
+
+
+def filter_cache(func: Callable[..., bool]) -> Callable[..., bool]:
+    """Memoize a filter's `filter` method with an LRU cache of
+    `FILTER_CACHE_SIZE` entries.
+
+    The cache is keyed by class and token, so it is shared by every
+    subclass which inherits the method.
+    """
+    cached = lru_cache(maxsize=FILTER_CACHE_SIZE)(func)
+    _filter_cache_registry.add(cached)
+    return cached
+
+
+def is_filter_cache(func: Any) -> bool:
+    return func in _filter_cache_registry
 
 
-class Filter(ABC):
+def set_filter_cache_size(maxsize: Optional[int]):
+    """Set how many verdicts each filter's cache may hold, for both existing
+    and future filters. `None` makes caches unbounded, and `0` disables them.
+
+    This replaces every existing cache with an empty one.
+    """
+    global FILTER_CACHE_SIZE
+    FILTER_CACHE_SIZE = maxsize
+
+    seen: Set[type] = set()
+    pending: List[type] = [Filter]
+    while pending:
+        klass = pending.pop()
+        if klass in seen:
+            continue
+        seen.add(klass)
+        pending.extend(klass.__subclasses__())
+
+        for name, attr in list(vars(klass).items()):
+            if isinstance(attr, classmethod) and is_filter_cache(attr.__func__):
+                old = attr.__func__
+                new = filter_cache(old.__wrapped__)  # type: ignore [attr-defined]
+                new.__dict__.update(old.__dict__)
+                setattr(klass, name, classmethod(new))
+
+
+def filter_caches(filter: Type["Filter"]) -> Dict[type, Any]:
+    """Find every filter cache which `filter` may use, including those of the
+    filters it was composed from, keyed by the class that owns each cache.
+
+    The owner's cache is also used by the owner's other subclasses.
+    """
+    caches: Dict[type, Any] = {}
+    pending: List[type] = [filter]
+    seen: Set[type] = set()
+    while pending:
+        f = pending.pop()
+        if f in seen:
+            continue
+        seen.add(f)
+        for klass in f.__mro__:
+            method = vars(klass).get("filter")
+            if isinstance(method, classmethod) and is_filter_cache(method.__func__):
+                caches[klass] = method.__func__
+        pending.extend(getattr(f, "filters", []))
+    return caches
+
+
+class Filter(metaclass=FactoryMeta):
     @classmethod
     @abstractmethod
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
         raise NotImplementedError
 
@@ -56,7 +135,7 @@ class MinLen(Filter):
     length = 0
 
     @classmethod
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
         if len(token) < cls.length:
             return False
@@ -66,7 +145,7 @@ class MinLen(Filter):
         class MinLenFilter(MinLen, filter):
             length = length_
 
-        return MinLenFilter
+        return made_by(MinLenFilter, cls, filter, length_)
 
 
 class Len(Filter):
@@ -93,7 +172,7 @@ class Len(Filter):
     maxlen = 0
 
     @classmethod
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
         tokenlen = len(token)
 
@@ -108,15 +187,19 @@ class Len(Filter):
             minlen = min
             maxlen = max
 
-        return LenFilter
+        return made_by(LenFilter, cls, filter, min, max)
 
 
 class RegexFilter(Filter):
     pattern: "re.Pattern[str]"
 
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        compile_pattern(cls, re.compile)
+
     @classmethod
     @override
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
         return not not re.fullmatch(cls.pattern, token)
 
@@ -124,11 +207,40 @@ class RegexFilter(Filter):
 class Regex1Filter(Filter):
     pattern: "regex.Pattern[str]"
 
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        compile_pattern(cls, compile_regex1)
+
     @classmethod
     @override
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
-        return not not regex.fullmatch(cls.pattern, token)
+        return not not cls.pattern.fullmatch(token)
+
+
+class AutomatonFilter(Filter):
+    """Matches tokens with a deterministic finite automaton, walking one table
+    lookup per character. Build `steps` and `accepting` with
+    `sonatoki.utils.compile_automaton`.
+
+    For small, fixed grammars this beats a regex, which has to be
+    entered once per token and backtracks on alternations.
+    """
+
+    steps: List[Dict[str, int]]
+    accepting: Tuple[bool, ...]
+
+    @classmethod
+    @override
+    @filter_cache
+    def filter(cls, token: str) -> bool:
+        steps = cls.steps
+        state: Optional[int] = 0
+        for char in token:
+            state = steps[state].get(char)
+            if state is None:
+                return False
+        return cls.accepting[state]
 
 
 class MemberFilter(Filter):
@@ -136,7 +248,7 @@ class MemberFilter(Filter):
 
     @classmethod
     @override
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
         return token.lower() in cls.tokens
 
@@ -152,7 +264,7 @@ class MemberFilter(Filter):
         class AnonMemberFilter(MemberFilter):
             tokens = parent_tokens
 
-        return AnonMemberFilter
+        return made_by(AnonMemberFilter, cls, add, sub)
 
 
 class SubsetFilter(Filter):
@@ -160,7 +272,7 @@ class SubsetFilter(Filter):
 
     @classmethod
     @override
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
         return set(token.lower()).issubset(cls.tokens)
 
@@ -193,7 +305,7 @@ class ProperName(Filter):
 
     @classmethod
     @override
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
         first_capitalized = token[0].isupper()
         all_caps = token.isupper()
@@ -216,7 +328,7 @@ class PuName(Filter):
 
     @classmethod
     @override
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
         # first_capitalized = token[0].isupper()
         # rest_capitalized = token[1:] == token[1:].upper()
@@ -241,7 +353,7 @@ class NimiLinkuByUsage:
         class AnonLinkuMemberFilter(MemberFilter):
             tokens = prep_dictionary(words)
 
-        return AnonLinkuMemberFilter
+        return made_by(AnonLinkuMemberFilter, cls, usage, date)
 
 
 class NimiLinkuByTag:
@@ -255,7 +367,7 @@ class NimiLinkuByTag:
         class AnonLinkuMemberFilter(MemberFilter):
             tokens = prep_dictionary(words)
 
-        return AnonLinkuMemberFilter
+        return made_by(AnonLinkuMemberFilter, cls, tag, category)
 
 
 NimiPu = NimiLinkuByTag("book", "pu")
@@ -276,7 +388,20 @@ class NimiUCSUR(MemberFilter):
     tokens = prep_dictionary(NIMI_UCSUR)
 
 
-class Phonotactic(RegexFilter):
+class PhonotacticRe(RegexFilter):
+    """Reference implementation of `Phonotactic`."""
+
+    pattern = Lazy(
+        lambda: re.compile(
+            rf"^((^[{VOWELS}]|[klmnps][{VOWELS}]|[jt][aeou]|[w][aei])(n(?![mn]))?)+$|^n$",
+            # Can't split initial vowel group off like in Syllabics because of
+            # consecutive nasal detection; it is costly to duplicate
+            flags=re.IGNORECASE,
+        )
+    )
+
+
+class Phonotactic(AutomatonFilter):
     """Determines if a given token is phonotactically valid Toki Pona (or `n`).
 
     Excludes both consecutive nasals and the illegal syllables:
@@ -285,13 +410,36 @@ class Phonotactic(RegexFilter):
 
     Note that if this validator is used after `Cleaners.ConsecutiveDuplicates`,
     "nn" cannot be found.
+
+    Matches exactly the same tokens as `PhonotacticRe`.
     """
 
-    pattern = re.compile(
-        rf"^((^[{VOWELS}]|[klmnps][{VOWELS}]|[jt][aeou]|[w][aei])(n(?![mn]))?)+$|^n$",
-        # Can't split initial vowel group off like in Syllabics because of
-        # consecutive nasal detection; it is costly to duplicate
-        flags=re.IGNORECASE,
+    # the equivalent regex, for those who generate or inspect tokens with it
+    pattern = Lazy(lambda: PhonotacticRe.pattern)
+
+    steps, accepting = compile_automaton(
+        {
+            "start": {
+                VOWELS: "vowel",
+                "n": "n",
+                "klmps": "onset",
+                "jt": "onset_jt",
+                "w": "onset_w",
+            },
+            "vowel": {"n": "coda", "klmps": "onset", "jt": "onset_jt", "w": "onset_w"},
+            # an "n" followed by a vowel was an onset after all
+            "coda": {
+                VOWELS: "vowel",
+                "klps": "onset",
+                "jt": "onset_jt",
+                "w": "onset_w",
+            },
+            "n": {VOWELS: "vowel"},
+            "onset": {VOWELS: "vowel"},
+            "onset_jt": {"aeou": "vowel"},
+            "onset_w": {"aei": "vowel"},
+        },
+        accepting={"vowel", "coda", "n"},
     )
 
 
@@ -299,18 +447,41 @@ class LongPhonotactic(Len, Phonotactic):
     minlen = 3
 
 
-class Syllabic(RegexFilter):
+class SyllabicRe(RegexFilter):
+    """Reference implementation of `Syllabic`."""
+
+    # rf"^((^[{VOWELS}]|[{CONSONANTS}][{VOWELS}])n?)+$|^n$"
+    # Alterative I was exploring takes ~15% more steps
+    pattern = Lazy(
+        lambda: re.compile(
+            rf"^(?:^[{VOWELS}]n?)?(?:[{CONSONANTS}][{VOWELS}]n?)*$|^n$",
+            flags=re.IGNORECASE,
+        )
+    )
+
+
+class Syllabic(AutomatonFilter):
     """Determines if a given token is syllabically valid Toki Pona (or `n`).
 
     Words must have correctly ordered vowels and consonants, but the
     phonotactic exceptions are not considered.
+
+    Matches exactly the same tokens as `SyllabicRe`.
     """
 
-    # rf"^((^[{VOWELS}]|[{CONSONANTS}][{VOWELS}])n?)+$|^n$"
-    # Alterative I was exploring takes ~15% more steps
-    pattern = re.compile(
-        rf"^(?:^[{VOWELS}]n?)?(?:[{CONSONANTS}][{VOWELS}]n?)*$|^n$",
-        flags=re.IGNORECASE,
+    # the equivalent regex, for those who generate or inspect tokens with it
+    pattern = Lazy(lambda: SyllabicRe.pattern)
+
+    steps, accepting = compile_automaton(
+        {
+            "start": {VOWELS: "vowel", "n": "n", "jklmpstw": "onset"},
+            "vowel": {"n": "coda", "jklmpstw": "onset"},
+            # an "n" followed by a vowel was an onset after all
+            "coda": {VOWELS: "vowel", CONSONANTS: "onset"},
+            "n": {VOWELS: "vowel"},
+            "onset": {VOWELS: "vowel"},
+        },
+        accepting={"start", "vowel", "coda", "n"},
     )
 
 
@@ -342,7 +513,7 @@ class Numeric(Filter):
 
     @classmethod
     @override
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, msg: str) -> bool:
         return msg.isnumeric()
 
@@ -365,7 +536,7 @@ class PunctuationRe(RegexFilter):
     Goes out of date compared to the `regex` library if UNICODE_PUNCT_RANGES is not updated.
     """
 
-    pattern = re.compile(rf"[{ALL_PUNCT_RANGES_STR}]+")
+    pattern = Lazy(lambda: re.compile(rf"[{constants.ALL_PUNCT_RANGES_STR}]+"))
 
 
 @deprecated(
@@ -375,8 +546,10 @@ class PunctuationRe1(Regex1Filter):
     """Reference implementation for identifying tokens made entirely of
     punctuation."""
 
-    pattern = regex.compile(
-        rf"[\p{{Punctuation}}\p{{posix_punct}}{NOT_IN_PUNCT_CLASS}{UCSUR_PUNCT_RANGES_STR}{EMOJI_VARIATION_SELECTOR_RANGES_STR}]+"
+    pattern = Lazy(
+        lambda: compile_regex1(
+            rf"[\p{{Punctuation}}\p{{posix_punct}}{NOT_IN_PUNCT_CLASS}{UCSUR_PUNCT_RANGES_STR}{EMOJI_VARIATION_SELECTOR_RANGES_STR}]+"
+        )
     )
 
 
@@ -406,7 +579,7 @@ class Or:
 
             @classmethod
             @override
-            @cache(maxsize=None)
+            @filter_cache
             def filter(cls, token: str) -> bool:
                 for f in cls.filters:
                     if f.filter(token):
@@ -440,10 +613,10 @@ class Or:
 
         if len(other_filters) == 1:  # we only had member filters
             # TODO: this sucks?
-            return other_filters[0]
+            return made_by(other_filters[0], cls, *filters)
 
         filter = cls.__generic_filter(*other_filters)
-        return filter
+        return made_by(filter, cls, *filters)
 
 
 class And:
@@ -463,14 +636,14 @@ class And:
 
             @classmethod
             @override
-            @cache(maxsize=None)
+            @filter_cache
             def filter(cls, token: str) -> bool:
                 for f in cls.filters:
                     if not f.filter(token):
                         return False
                 return True
 
-        return AnonymousAndFilter
+        return made_by(AnonymousAndFilter, cls, *filters_)
 
 
 class Not(Filter):
@@ -487,20 +660,20 @@ class Not(Filter):
     """
 
     @classmethod
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
         return not super().filter(token)
 
     def __new__(cls, filter: Type[Filter]) -> Type[Filter]:
         class NotFilter(Not, filter): ...
 
-        return NotFilter
+        return made_by(NotFilter, cls, filter)
 
 
 class Pass(Filter):
     @classmethod
     @override
-    @cache(maxsize=None)
+    @filter_cache
     def filter(cls, token: str) -> bool:
         return True
 
@@ -508,6 +681,344 @@ class Pass(Filter):
 class Fail(Not, Pass): ...
 
 
+# A filter tree, decomposed for `compile_filter`. Each node is a kind and its data:
+# "const": bool, "member": FrozenSet[str], "subset": FrozenSet[str],
+# "regex": compiled pattern, "automaton": (steps, accepting),
+# "opaque": a filter's own `filter`, "len": (min, max, node), "not": node,
+# "or": List[node], "and": List[node]
+Node = Tuple[str, Any]
+
+# cheapest first; composites cost as much as their costliest part
+_NODE_COSTS = {"const": 0, "member": 1, "subset": 2, "automaton": 3, "regex": 4}
+
+
+def _is_pattern(pattern: Any) -> bool:
+    """Whether `pattern` was compiled by `re` or `regex`, rather than being
+    a str set after its class was made."""
+    if isinstance(pattern, re.Pattern):
+        return True
+    # only an imported `regex` can have compiled it
+    regex = sys.modules.get("regex")
+    return regex is not None and isinstance(pattern, regex.Pattern)
+
+
+def _decompose(filter: Type[Filter], start: int = 0) -> Node:
+    """Decompose `filter` as though its `filter` method were looked up from
+    `filter.__mro__[start]`, as `super()` does."""
+    mro = filter.__mro__
+    for i in range(start, len(mro)):
+        if "filter" in vars(mro[i]):
+            break
+    owner = mro[i]
+
+    if owner is Len:
+        return "len", (filter.minlen, filter.maxlen, _decompose(filter, i + 1))
+    if owner is MinLen:
+        return "len", (filter.length, 0, _decompose(filter, i + 1))
+    if owner is Not:
+        return "not", _decompose(filter, i + 1)
+    if owner is Pass:
+        return "const", True
+    if owner is MemberFilter:
+        return "member", frozenset(filter.tokens)
+    if owner is SubsetFilter:
+        return "subset", frozenset(filter.tokens)
+    if owner in (RegexFilter, Regex1Filter) and _is_pattern(filter.pattern):
+        return "regex", filter.pattern
+    if owner is AutomatonFilter:
+        return "automaton", (filter.steps, filter.accepting)
+
+    factory = vars(owner).get("_factory")
+    if factory and factory[0] in (Or, And):
+        children = [_decompose(f) for f in owner.filters]  # type: ignore [attr-defined]
+        return ("or" if factory[0] is Or else "and"), children
+
+    # anything else is evaluated as-is, with its own cache, which is looked up
+    # on each call since `set_filter_cache_size` replaces it
+    def opaque(token: str, owner: type = owner) -> bool:
+        return owner.__dict__["filter"].__func__(filter, token)
+
+    return "opaque", opaque
+
+
+def _cost(node: Node) -> float:
+    kind, data = node
+    if kind == "opaque":
+        return float("inf")
+    if kind == "len":
+        return _cost(data[2])
+    if kind == "not":
+        return _cost(data)
+    if kind in ("or", "and"):
+        return max(map(_cost, data), default=0)
+    return _NODE_COSTS[kind]
+
+
+def _order(nodes: List[Node]) -> List[Node]:
+    """Sort nodes to run the cheapest first. Nodes with opaque filters keep
+    their order after every other node, so they run no more often than they
+    did before compiling."""
+    pure = [n for n in nodes if _cost(n) != float("inf")]
+    opaque = [n for n in nodes if _cost(n) == float("inf")]
+    return sorted(pure, key=_cost) + opaque
+
+
+def _merge_regexes(patterns: List[Any]) -> List[Any]:
+    """Join `re` patterns with the same flags into one alternation, which
+    fully matches a token if and only if any of them do.
+
+    Patterns with groups are left alone, since joining them would
+    renumber their groups and break any backreferences.
+    """
+    by_flags: Dict[int, List["re.Pattern[str]"]] = {}
+    merged: List[Any] = []
+    for p in patterns:
+        if isinstance(p, re.Pattern) and not p.groups:
+            by_flags.setdefault(p.flags, []).append(p)
+        else:
+            merged.append(p)
+
+    for flags, group in by_flags.items():
+        if len(group) == 1:
+            merged.extend(group)
+            continue
+        try:
+            joined = re.compile("|".join(f"(?:{p.pattern})" for p in group), flags)
+        except re.error:  # e.g. inline flags, which must lead the whole pattern
+            merged.extend(group)
+            continue
+        merged.append(joined)
+    return merged
+
+
+def _simplify(node: Node) -> Node:
+    kind, data = node
+
+    if kind == "not":
+        child = _simplify(data)
+        if child[0] == "const":
+            return "const", not child[1]
+        if child[0] == "not":
+            return child[1]
+        return "not", child
+
+    if kind == "len":
+        minlen, maxlen, child = data
+        child = _simplify(child)
+        if child[0] == "const" and not child[1]:
+            return child
+        if child[0] == "len":
+            inner_min, inner_max, child = child[1]
+            minlen = max(minlen, inner_min)
+            maxlen = min(maxlen or inner_max, inner_max or maxlen)
+        if not minlen and not maxlen:
+            return child
+        return "len", (minlen, maxlen, child)
+
+    if kind in ("or", "and"):
+        # for "or", True decides the result and False changes nothing
+        decisive = kind == "or"
+        children: List[Node] = []
+        for child in map(_simplify, data):
+            if child[0] == kind:
+                children.extend(child[1])
+            elif child[0] == "const":
+                if child[1] == decisive:
+                    return child
+            else:
+                children.append(child)
+
+        members = [c[1] for c in children if c[0] == "member"]
+        if len(members) >= 2:
+            tokens = (
+                members[0].union(*members)
+                if decisive
+                else members[0].intersection(*members)
+            )
+            children = [c for c in children if c[0] != "member"] + [("member", tokens)]
+        if decisive:
+            patterns = [c[1] for c in children if c[0] == "regex"]
+            if len(patterns) >= 2:
+                children = [c for c in children if c[0] != "regex"]
+                children += [("regex", p) for p in _merge_regexes(patterns)]
+
+        if not children:
+            return "const", not decisive
+        if len(children) == 1:
+            return children[0]
+        return kind, _order(children)
+
+    return node
+
+
+def _emit(node: Node) -> Callable[[str], bool]:
+    kind, data = node
+
+    if kind == "const":
+        return (lambda token: True) if data else (lambda token: False)
+
+    if kind == "member":
+        tokens = data
+        return lambda token: token.lower() in tokens
+
+    if kind == "subset":
+        issuperset = data.issuperset
+        return lambda token: issuperset(token.lower())
+
+    if kind == "regex":
+        fullmatch = data.fullmatch
+        return lambda token: fullmatch(token) is not None
+
+    if kind == "automaton":
+        steps, accepting = data
+
+        def walk(token: str) -> bool:
+            state: Optional[int] = 0
+            for char in token:
+                state = steps[state].get(char)
+                if state is None:
+                    return False
+            return accepting[state]
+
+        return walk
+
+    if kind == "opaque":
+        return data
+
+    if kind == "len":
+        minlen, maxlen, child = data
+        inner = _emit(child)
+        if not maxlen:
+            return lambda token: len(token) >= minlen and inner(token)
+        return lambda token: minlen <= len(token) <= maxlen and inner(token)
+
+    if kind == "not":
+        if data[0] == "member":
+            tokens = data[1]
+            return lambda token: token.lower() not in tokens
+        inner = _emit(data)
+        return lambda token: not inner(token)
+
+    funcs = [_emit(child) for child in data]
+    if kind == "or":
+        if len(funcs) == 2:
+            first, second = funcs
+            return lambda token: first(token) or second(token)
+
+        def any_match(token: str) -> bool:
+            for f in funcs:
+                if f(token):
+                    return True
+            return False
+
+        return any_match
+
+    if len(funcs) == 2:
+        first, second = funcs
+        return lambda token: first(token) and second(token)
+
+    def all_match(token: str) -> bool:
+        for f in funcs:
+            if not f(token):
+                return False
+        return True
+
+    return all_match
+
+
+def compile_filter(*filters: Type[Filter]) -> Callable[[str], bool]:
+    """Compile a filter into one function which returns the same result for
+    every token, but with less overhead. If given several filters, the
+    function matches when any of them does, like `Or`. If given none, it
+    never matches.
+
+    Composed filters such as `Or`, `And`, `Not`, and `Len` are flattened.
+    Length bounds are checked first, members of `MemberFilter`s are merged
+    into one set, regexes are joined into one, double negation cancels
+    out, and cheap checks run before expensive ones. Any other filter is
+    called as-is.
+
+    The compiled function does not use or fill the filters' caches, except
+    for filters it calls as-is.
+    """
+    node: Node = "or", [_decompose(f) for f in filters]
+    return _emit(_simplify(node))
+
+
+def compile_classifier(filters: List[Type[Filter]]) -> Callable[[str], int]:
+    """Compile a list of filters into one function which returns the index of
+    the first filter matching a token, or -1 if none match.
+
+    Filters made only of `MemberFilter`s, optionally with length bounds,
+    are answered by one lookup in a map from each member to the filters
+    containing it. Filters made only of `re` patterns are answered by one
+    regex with a named group per filter. The rest are compiled with
+    `compile_filter` and tried in order, stopping at the first match or
+    once no earlier filter is left to try.
+    """
+    members: Dict[str, List[int]] = {}
+    bounds: Dict[int, Tuple[int, float]] = {}
+    patterns: Dict[int, List[str]] = {}  # by flags
+    others: List[Tuple[int, Callable[[str], bool]]] = []
+
+    for i, f in enumerate(filters):
+        node = _simplify(_decompose(f))
+        minlen, maxlen = 0, 0
+        kind, data = node
+        if kind == "len":
+            minlen, maxlen, inner = data
+            kind, data = inner
+
+        if kind == "member":
+            for token in data:
+                members.setdefault(token, []).append(i)
+            bounds[i] = (minlen, maxlen or float("inf"))
+        elif node[0] == "regex" and isinstance(data, re.Pattern) and not data.groups:
+            # bounded patterns are left to `others`, which check the bounds
+            patterns.setdefault(data.flags, []).append(f"(?P<f{i}>{data.pattern})")
+        else:
+            others.append((i, _emit(node)))
+
+    combined: List[Callable[[str], Optional[re.Match[str]]]] = []
+    for flags, group in patterns.items():
+        try:
+            combined.append(re.compile("|".join(group), flags).fullmatch)
+        except re.error:  # e.g. inline flags, which must lead the whole pattern
+            for alternative in group:
+                combined.append(re.compile(alternative, flags).fullmatch)
+
+    nomatch = len(filters)
+
+    def classify(token: str) -> int:
+        best = nomatch
+
+        candidates = members.get(token.lower())
+        if candidates:
+            length = len(token)
+            for i in candidates:
+                minlen, maxlen = bounds[i]
+                if minlen <= length <= maxlen:
+                    best = i
+                    break
+
+        for fullmatch in combined:
+            match = fullmatch(token)
+            if match:
+                # the first alternative to match is the earliest filter
+                best = min(best, int(match.lastgroup[1:]))  # type: ignore [index]
+
+        for i, f in others:
+            if i >= best:
+                break
+            if f(token):
+                best = i
+                break
+
+        return best if best < nomatch else -1
+
+    return classify
+
+
 __all__ = [
     "Alphabetic",
     "And",
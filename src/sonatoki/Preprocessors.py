@@ -18,42 +18,108 @@ It is up to the user to order them appropriately.
 
 # STL
 import re
-from abc import ABC, abstractmethod
-from typing import List, Type
+from abc import abstractmethod
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Any, Set, List, Type, Tuple, Callable, Optional
+from difflib import SequenceMatcher
 
 # PDM
-import emoji
-import regex
 from typing_extensions import override
 
-regex.DEFAULT_VERSION = regex.VERSION1
+# LOCAL
+from sonatoki.types import Edit, Span
+from sonatoki.utils import (
+    Lazy,
+    FactoryMeta,
+    compile_regex1,
+    compile_pattern,
+    find_unicode_ranges,
+)
 
+if TYPE_CHECKING:
+    # PDM
+    import regex
+
+
+class Preprocessor(metaclass=FactoryMeta):
+    triggers: Optional[Set[str]] = None
+    """Strings of which at least one appears in anything this preprocessor
+    would change. If none of them are in a message, the preprocessor is
+    skipped. If `None`, it is never skipped."""
 
-class Preprocessor(ABC):
     @classmethod  # order matters
     @abstractmethod
     def process(cls, msg: str) -> str:
         raise NotImplementedError
 
+    @classmethod
+    def edits(cls, msg: str) -> List[Edit]:
+        """Find the replacements `process` makes in `msg`, in order.
+
+        By default, these are found by comparing `msg` to what `process`
+        returns. Making them always gives the same result as `process`, but
+        they may not be the replacements `process` actually made.
+        """
+        processed = cls.process(msg)
+        if processed == msg:
+            return []
+
+        matcher = SequenceMatcher(None, msg, processed, autojunk=False)
+        return [
+            Edit(i1, i2, processed[j1:j2])
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+            if tag != "equal"
+        ]
+
 
 class RegexPreprocessor(Preprocessor):
     pattern: "re.Pattern[str]"
     replace: str = " "
 
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        compile_pattern(cls, re.compile)
+        # triggers are only known to hold for the pattern they were written for
+        if "pattern" in vars(cls) and "triggers" not in vars(cls):
+            cls.triggers = None
+
     @classmethod
     @override
     def process(cls, msg: str) -> str:
         return re.sub(cls.pattern, cls.replace, msg)
 
+    @classmethod
+    @override
+    def edits(cls, msg: str) -> List[Edit]:
+        return [
+            Edit(match.start(), match.end(), match.expand(cls.replace))
+            for match in cls.pattern.finditer(msg)
+        ]
+
 
 class Regex1Preprocessor(Preprocessor):
     pattern: "regex.Pattern[str]"
     replace: str = " "
 
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        compile_pattern(cls, compile_regex1)
+        # triggers are only known to hold for the pattern they were written for
+        if "pattern" in vars(cls) and "triggers" not in vars(cls):
+            cls.triggers = None
+
     @classmethod
     @override
     def process(cls, msg: str) -> str:
-        return regex.sub(cls.pattern, cls.replace, msg)
+        return cls.pattern.sub(cls.replace, msg)
+
+    @classmethod
+    @override
+    def edits(cls, msg: str) -> List[Edit]:
+        return [
+            Edit(match.start(), match.end(), match.expand(cls.replace))
+            for match in cls.pattern.finditer(msg)
+        ]
 
 
 """
@@ -73,6 +139,7 @@ class URLs(RegexPreprocessor):
     """Remove http(s) protocol URLs."""
 
     pattern = re.compile(r"https?:\/\/\S+")
+    triggers = {"://"}
 
 
 class MarkdownURLs(RegexPreprocessor):
@@ -81,6 +148,7 @@ class MarkdownURLs(RegexPreprocessor):
 
     pattern = re.compile(r"\[(.+?)\]\(https?:\/\/\S+\)")
     replace = r"\1"
+    triggers = {"](http"}
 
 
 class Emails(RegexPreprocessor):
@@ -94,6 +162,7 @@ class Emails(RegexPreprocessor):
         r"\b[a-zA-Z0-9._%+-]{2,}@[a-zA-Z0-9.-]{2,}\.[a-zA-Z]{2,24}\b",
         flags=re.IGNORECASE,
     )
+    triggers = {"@"}
 
 
 class Reference(RegexPreprocessor):
@@ -104,30 +173,36 @@ class Reference(RegexPreprocessor):
     """
 
     pattern = re.compile(r"\[\[.+\]\]")
+    triggers = {"[["}
 
 
 class DiscordEmotes(RegexPreprocessor):
     """Remove text-formatted Discord emotes `<flags:name:id>`"""
 
     pattern = re.compile(r"<a?:[a-zA-Z0-9_]{2,}:[0-9]{2,}>")
+    triggers = {"<"}
 
 
 class ColonEmotes(RegexPreprocessor):
     """Remove colon-marked emotes `:name:`"""
 
     pattern = re.compile(r":[a-zA-Z0-9_]{2,}:")
+    triggers = {":"}
 
 
 class DiscordMentions(RegexPreprocessor):
     pattern = re.compile(r"<@[\!\&]?[0-9]{2,}>")
+    triggers = {"<@"}
 
 
 class DiscordChannels(RegexPreprocessor):
     pattern = re.compile(r"<#[0-9]{2,}>")
+    triggers = {"<#"}
 
 
 class DiscordSpecial(RegexPreprocessor):
     pattern = re.compile(r"<id:[a-zA-Z0-9_]{4,}>")
+    triggers = {"<id:"}
 
 
 class AngleBracketObject(RegexPreprocessor):
@@ -138,6 +213,7 @@ class AngleBracketObject(RegexPreprocessor):
     """
 
     pattern = re.compile(r"<[^<>\s]+>")
+    triggers = {"<"}
 
 
 """
@@ -153,16 +229,19 @@ would likely be using a language other than Toki Pona.
 
 class SingleQuotes(RegexPreprocessor):
     pattern = re.compile(r"'[^']+'", flags=re.DOTALL)
+    triggers = {"'"}
 
 
 class DoubleQuotes(RegexPreprocessor):
     pattern = re.compile(r'"[^"]+"', flags=re.DOTALL)
+    triggers = {'"'}
 
 
 class Backticks(RegexPreprocessor):
     """Remove paired backticks and their contents `like this`"""
 
     pattern = re.compile(r"`[^`]+`", flags=re.DOTALL)
+    triggers = {"`"}
 
 
 class Codeblock(RegexPreprocessor):
@@ -175,18 +254,21 @@ class Codeblock(RegexPreprocessor):
         r"```.+?```",
         flags=re.DOTALL,
     )
+    triggers = {"```"}
 
 
 class Spoilers(RegexPreprocessor):
     """Remove paired double bars and their contents `||like this||`"""
 
     pattern = re.compile(r"\|\|(?:(?!\|\|).)+\|\|", flags=re.DOTALL)
+    triggers = {"||"}
 
 
 class ArrowQuote(RegexPreprocessor):
     """Remove lines beginning with `> `"""
 
     pattern = re.compile(r"^>\ .+$", re.MULTILINE)
+    triggers = {"> "}
 
 
 class AllQuotes(RegexPreprocessor):
@@ -201,13 +283,52 @@ class AllQuotes(RegexPreprocessor):
         ),
         flags=re.MULTILINE | re.DOTALL,
     )
+    triggers = {"'", '"', "`", "> "}
+
+
+def emoji_starts() -> "re.Pattern[str]":
+    """Match any character without which no emoji can be found in a string,
+    as `emoji.replace_emoji` finds them.
+
+    That is the first non-ascii character of every emoji, and the
+    variation selectors, which `replace_emoji` drops wherever they are.
+    """
+    # PDM
+    import emoji  # deferred because it is slow to import
+
+    chars = {"\ufe0e", "\ufe0f"}
+    for e in emoji.EMOJI_DATA:
+        chars.add(next(c for c in e if not c.isascii()))
+    return re.compile(f"[{''.join(find_unicode_ranges(''.join(chars)))}]")
 
 
 class Emoji(Preprocessor):
+    """Remove emoji, exactly as `emoji.replace_emoji` does.
+
+    `replace_emoji` walks the whole message in Python, but most messages
+    have no emoji. Those are passed through after checking that they are
+    entirely ascii, or after one regex scan for any character that could
+    be part of an emoji. Otherwise, only the message from just before the
+    first such character is given to `replace_emoji`.
+    """
+
+    starts = Lazy(emoji_starts)
+
     @classmethod
     @override
     def process(cls, msg: str) -> str:
-        return emoji.replace_emoji(msg)
+        if msg.isascii():
+            return msg
+        start = cls.starts.search(msg)
+        if not start:
+            return msg
+
+        # PDM
+        import emoji  # deferred because it is slow to import
+
+        # an emoji may begin with one ascii character, like the keycap "#️⃣"
+        cut = max(start.start() - 1, 0)
+        return msg[:cut] + emoji.replace_emoji(msg[cut:])
 
 
 class ZeroWidths(RegexPreprocessor):
@@ -229,6 +350,129 @@ class ZeroWidths(RegexPreprocessor):
     """
 
     pattern = re.compile("[\\U0000200C-\\U0000200D]")
+    triggers = {"\u200c", "\u200d"}
+
+
+def compile_preprocessors(
+    preprocessors: List[Type[Preprocessor]],
+    wrap: Optional[Callable[[type, Callable[[str], str]], Callable[[str], str]]] = None,
+) -> Callable[[str], str]:
+    """Compile a list of preprocessors into one function which applies them in
+    order, skipping each one whose `triggers` are all absent from the
+    message.
+
+    One scan for the first characters of every trigger rules out most
+    messages at once, so a message with none of them only passes through
+    the preprocessors without triggers. The scan is repeated whenever a
+    preprocessor changes the message.
+
+    If given, `wrap` is called with each preprocessor and its `process`,
+    and what it returns is called in place of `process`.
+    """
+    processes = [p.process for p in preprocessors]
+    if wrap is not None:
+        processes = [wrap(p, process) for p, process in zip(preprocessors, processes)]
+    triggers = [p.triggers for p in preprocessors]
+
+    firsts = {t[0] for ts in triggers if ts for t in ts}
+    if not firsts:
+        any_trigger: Callable[[str], object] = lambda msg: False
+    else:
+        any_trigger = re.compile(
+            "[" + "".join(re.escape(c) for c in sorted(firsts)) + "]"
+        ).search
+
+    def preprocess(msg: str) -> str:
+        maybe = any_trigger(msg)
+        for process, ts in zip(processes, triggers):
+            if ts is not None:
+                if not maybe:
+                    continue
+                for t in ts:
+                    if t in msg:
+                        break
+                else:
+                    continue
+
+            processed = process(msg)
+            if processed != msg:
+                msg = processed
+                maybe = any_trigger(msg)
+        return msg
+
+    return preprocess
+
+
+class Offsets:
+    """Map spans of a preprocessed message back to spans of the message before
+    preprocessing, through every edit each preprocessor made.
+
+    A span which starts or ends within text a preprocessor inserted is
+    widened to all of the text that insertion replaced.
+    """
+
+    def __init__(self):
+        # per pass: where each edit's text starts and ends in the output,
+        # and the edits themselves
+        self.__passes: List[Tuple[List[int], List[int], List[Edit]]] = []
+
+    def apply(self, msg: str, edits: List[Edit]) -> str:
+        """Make `edits` in `msg`, and record them as the next pass."""
+        if not edits:
+            return msg
+
+        parts: List[str] = []
+        starts: List[int] = []
+        ends: List[int] = []
+        last = 0
+        length = 0
+        for edit in edits:
+            parts.append(msg[last : edit.start])
+            length += edit.start - last
+            starts.append(length)
+            parts.append(edit.text)
+            length += len(edit.text)
+            ends.append(length)
+            last = edit.end
+        parts.append(msg[last:])
+
+        self.__passes.append((starts, ends, edits))
+        return "".join(parts)
+
+    def original(self, span: Span) -> Span:
+        """Map a span of the last pass's output to the span it came from in
+        the first pass's input."""
+        start, end = span
+        for starts, ends, edits in reversed(self.__passes):
+            # the last edit whose text starts at or before `start`
+            i = bisect_right(starts, start) - 1
+            if i >= 0:
+                if start < ends[i]:
+                    start = edits[i].start
+                else:
+                    start += edits[i].end - ends[i]
+
+            # the last edit whose text starts before `end`
+            i = bisect_left(starts, end) - 1
+            if i >= 0:
+                if end <= ends[i]:
+                    end = edits[i].end
+                else:
+                    end += edits[i].end - ends[i]
+        return start, end
+
+
+def preprocess_with_offsets(
+    preprocessors: List[Type[Preprocessor]], msg: str
+) -> Tuple[str, Offsets]:
+    """Apply each preprocessor in order, as `compile_preprocessors` does, also
+    returning the `Offsets` which map the result back to `msg`."""
+    offsets = Offsets()
+    for p in preprocessors:
+        if p.triggers is not None and not any(t in msg for t in p.triggers):
+            continue
+        msg = offsets.apply(msg, p.edits(msg))
+    return msg, offsets
 
 
 RECOMMENDED_PREPROCESSORS: List[Type[Preprocessor]] = [
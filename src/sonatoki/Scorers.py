@@ -1,17 +1,23 @@
 # STL
 import math
 from abc import ABC, abstractmethod
-from typing import List, Type
+from typing import List, Type, Tuple, Iterable, Optional, Sequence
+from functools import lru_cache
+from itertools import islice, accumulate
 
 # PDM
 from typing_extensions import override
 
 # LOCAL
-from sonatoki.types import Number, Scorecard
+from sonatoki.types import Number, Verdict, Scorecard
+from sonatoki.utils import FactoryMeta, made_by
 from sonatoki.Filters import Pass, Filter
 
 
-class Scorer(ABC):
+class Scorer(metaclass=FactoryMeta):
+    # each way of scoring, which must agree with every way before it
+    SCORING = ("score", "score_indices", "score_verdicts", "passes")
+
     @classmethod
     @abstractmethod
     def score(cls, tokens: List[str], filters: List[Type[Filter]]) -> Number:
@@ -19,6 +25,172 @@ class Scorer(ABC):
         `Number` between 0 and 1 inclusive."""
         raise NotImplementedError
 
+    @classmethod
+    def score_indices(
+        cls,
+        tokens: List[str],
+        indices: List[int],
+        filters: List[Type[Filter]],
+    ) -> Number:
+        """Score a list of tokens given `indices`, the index of the first of
+        `filters` matching each token, or -1 if no filter matches it. Must
+        return the same as `score(tokens, filters)`.
+
+        Scorers which only need to know which filter matched each token
+        should override this to avoid re-running the filters. By default,
+        it falls back to `score`.
+        """
+        return cls.score(tokens, filters)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def _mirrors_score(cls, *names: str) -> bool:
+        """Whether every class which `cls` inherits a way of scoring from,
+        before `names[0]` in `SCORING`, also defines one of `names`.
+
+        The scorers here override later ways of scoring to give the same
+        result as their own earlier ones, only faster. A subclass which
+        overrides an earlier way alone would be ignored by them, so they
+        fall back to the earlier ways unless this is true.
+        """
+        earlier = cls.SCORING[: cls.SCORING.index(names[0])]
+        for klass in cls.__mro__:
+            attrs = vars(klass)
+            if any(way in attrs for way in earlier) and not any(
+                name in attrs for name in names
+            ):
+                return False
+        return True
+
+    @classmethod
+    def score_verdicts(
+        cls, verdicts: Iterable[Verdict], filters: List[Type[Filter]]
+    ) -> Optional[Number]:
+        """Score the tokens judged by `verdicts`, or return None if no token was
+        left after cleaning.
+
+        Must return the same as `score_indices` on the cleaned tokens.
+        Scorers which do not need every cleaned token at once should
+        override this to score them as they are read, without collecting
+        them into lists.
+        """
+        tokens: List[str] = []
+        indices: List[int] = []
+        for _, token, index in verdicts:
+            if token:
+                tokens.append(token)
+                indices.append(index)
+        if not tokens:
+            return None
+        return cls.score_indices(tokens, indices, filters)
+
+    @classmethod
+    def passes(
+        cls,
+        verdicts: Iterable[Verdict],
+        count: int,
+        filters: List[Type[Filter]],
+        passing_score: Number,
+    ) -> Optional[bool]:
+        """Decide whether the tokens judged by `verdicts` score at least
+        `passing_score`, or return None if no token was left after
+        cleaning. `count` is how many verdicts there are.
+
+        Must agree with `score_indices` on the cleaned tokens. Scorers
+        whose score can be bounded before every token is judged should
+        override this to stop as soon as the result is certain, since
+        `verdicts` are only made as they are read.
+        """
+        score = cls.score_verdicts(verdicts, filters)
+        if score is None:
+            return None
+        return score >= passing_score
+
+    @classmethod
+    def bounds(
+        cls, lowest: Number, highest: Number, fewest: int, most: int
+    ) -> Tuple[Number, Number]:
+        """Map the lowest and highest possible fraction of points, and the
+        fewest and most tokens there could be, to the lowest and highest
+        possible score. See `_passes_linear`."""
+        return lowest, highest
+
+    @classmethod
+    def _passes_linear(
+        cls,
+        verdicts: Iterable[Verdict],
+        count: int,
+        points: Sequence[int],
+        passing_score: Number,
+    ) -> Optional[bool]:
+        """`passes` for scorers whose score is the sum of each token's points
+        divided by the most points those tokens could have had, where a
+        token matching filter `index` earns `points[index]`.
+
+        The score is bounded by supposing every token left earns either no
+        points or the most points, and judging stops once both bounds fall
+        on the same side of `passing_score`. Since each token moves the
+        total by at most the most points, the bounds are only checked once
+        enough tokens are judged that they could have crossed it, and never
+        more often than every 8 tokens, which is about when checking them
+        costs less than judging the tokens would.
+        """
+        best = points[0]
+        bounds = cls.bounds
+        total = 0
+        counted = 0
+        remaining = count
+        verdicts = iter(verdicts)
+        step = 8
+        while remaining > step:
+            for _, token, index in islice(verdicts, step):
+                if token:
+                    counted += 1
+                    total += points[index]
+            remaining -= step
+
+            most = counted + remaining
+            if counted:
+                lowest, highest = bounds(
+                    total / (most * best),
+                    (total + remaining * best) / (most * best),
+                    counted,
+                    most,
+                )
+                if lowest >= passing_score:
+                    return True
+                if highest < passing_score:
+                    return False
+
+            needed = passing_score * most * best
+            margin = min(needed - total, total + remaining * best - needed)
+            step = max(int(margin / best), 8)
+
+        score = cls._score_linear(verdicts, points, total, counted)
+        if score is None:
+            return None
+        return score >= passing_score
+
+    @classmethod
+    def _score_linear(
+        cls,
+        verdicts: Iterable[Verdict],
+        points: Sequence[int],
+        total: int = 0,
+        counted: int = 0,
+    ) -> Optional[Number]:
+        """`score_verdicts` for the scorers described in `_passes_linear`,
+        adding to the `total` points of `counted` tokens already judged."""
+        for _, token, index in verdicts:
+            if token:
+                counted += 1
+                total += points[index]
+        if not counted:
+            return None
+        score = total / (counted * points[0])
+        # an exact score is its own bounds
+        return cls.bounds(score, score, counted, counted)[0]
+
 
 class Soften(Scorer):
     """Meta `Scorer` which scales the scores of short messages to reduce the
@@ -46,10 +218,38 @@ class Soften(Scorer):
         percentage **= cls.sigmoid(len_tokens)
         return percentage
 
+    @classmethod
+    @override
+    def score_indices(
+        cls,
+        tokens: List[str],
+        indices: List[int],
+        filters: List[Type[Filter]],
+    ) -> Number:
+        parent = super().score_indices
+        if (
+            parent.__func__ is Scorer.score_indices.__func__  # type: ignore [attr-defined]
+            or not cls._mirrors_score("score_indices")
+        ):
+            # falls back to `score`, which softens by itself
+            return cls.score(tokens, filters)
+
+        percentage = parent(tokens, indices, filters)
+        percentage **= cls.sigmoid(len(tokens))
+        return percentage
+
+    @classmethod
+    @override
+    def bounds(
+        cls, lowest: Number, highest: Number, fewest: int, most: int
+    ) -> Tuple[Number, Number]:
+        # percentages are at most 1, so fewer tokens soften more
+        return lowest ** cls.sigmoid(most), highest ** cls.sigmoid(fewest)
+
     def __new__(cls, scorer: Type[Scorer]) -> Type[Scorer]:
         class SoftenedScorer(Soften, scorer): ...
 
-        return SoftenedScorer
+        return made_by(SoftenedScorer, cls, scorer)
 
 
 class PassFail(Scorer):
@@ -65,6 +265,12 @@ class PassFail(Scorer):
                 return 1
         return 0
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def points(len_filters: int) -> Tuple[int, ...]:
+        """What a token earns for matching each filter, then for none."""
+        return (1,) * len_filters + (0,)
+
     @classmethod
     @override
     def score(cls, tokens: List[str], filters: List[Type[Filter]]) -> Number:
@@ -77,6 +283,48 @@ class PassFail(Scorer):
             total_score += cls.score_token(token, filters)
         return total_score / len_tokens if len_tokens else 0
 
+    @classmethod
+    @override
+    def score_indices(
+        cls,
+        tokens: List[str],
+        indices: List[int],
+        filters: List[Type[Filter]],
+    ) -> Number:
+        if not cls._mirrors_score("score_indices"):
+            return cls.score(tokens, filters)
+        if not tokens:
+            return 1
+
+        total_score = 0
+        for index in indices:
+            if index >= 0:
+                total_score += 1
+        return total_score / len(tokens)
+
+    @classmethod
+    @override
+    def score_verdicts(
+        cls, verdicts: Iterable[Verdict], filters: List[Type[Filter]]
+    ) -> Optional[Number]:
+        if not filters or not cls._mirrors_score("score_verdicts", "bounds"):
+            return super().score_verdicts(verdicts, filters)
+        return cls._score_linear(verdicts, cls.points(len(filters)))
+
+    @classmethod
+    @override
+    def passes(
+        cls,
+        verdicts: Iterable[Verdict],
+        count: int,
+        filters: List[Type[Filter]],
+        passing_score: Number,
+    ) -> Optional[bool]:
+        if not filters or not cls._mirrors_score("passes", "bounds"):
+            return super().passes(verdicts, count, filters, passing_score)
+        points = cls.points(len(filters))
+        return cls._passes_linear(verdicts, count, points, passing_score)
+
 
 class Scaling(Scorer):
     """Tokens score 1 for matching the first filter, and a linearly reduced
@@ -98,6 +346,12 @@ class Scaling(Scorer):
                 return scale - i
         return 0
 
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def points(len_filters: int) -> Tuple[int, ...]:
+        """What a token earns for matching each filter, then for none."""
+        return (*range(len_filters, 0, -1), 0)
+
     @classmethod
     @override
     def score(cls, tokens: List[str], filters: List[Type[Filter]]) -> Number:
@@ -111,6 +365,50 @@ class Scaling(Scorer):
             total_score += cls.score_token(token, filters, len_filters)
         return total_score / max_score if max_score else 0
 
+    @classmethod
+    @override
+    def score_indices(
+        cls,
+        tokens: List[str],
+        indices: List[int],
+        filters: List[Type[Filter]],
+    ) -> Number:
+        if not cls._mirrors_score("score_indices"):
+            return cls.score(tokens, filters)
+        if not tokens:
+            return 1
+
+        total_score = 0
+        len_filters = len(filters)
+        max_score = len(tokens) * len_filters
+        for index in indices:
+            if index >= 0:
+                total_score += len_filters - index
+        return total_score / max_score if max_score else 0
+
+    @classmethod
+    @override
+    def score_verdicts(
+        cls, verdicts: Iterable[Verdict], filters: List[Type[Filter]]
+    ) -> Optional[Number]:
+        if not filters or not cls._mirrors_score("score_verdicts", "bounds"):
+            return super().score_verdicts(verdicts, filters)
+        return cls._score_linear(verdicts, cls.points(len(filters)))
+
+    @classmethod
+    @override
+    def passes(
+        cls,
+        verdicts: Iterable[Verdict],
+        count: int,
+        filters: List[Type[Filter]],
+        passing_score: Number,
+    ) -> Optional[bool]:
+        if not filters or not cls._mirrors_score("passes", "bounds"):
+            return super().passes(verdicts, count, filters, passing_score)
+        points = cls.points(len(filters))
+        return cls._passes_linear(verdicts, count, points, passing_score)
+
 
 class Voting(Scaling):
     """Derives from `Scaling` in assigning scores from 0 to 1 based on the
@@ -135,7 +433,7 @@ class Voting(Scaling):
             prereq = filter
             threshold = threshold_
 
-        return AnonVoting
+        return made_by(AnonVoting, cls, filter, threshold_)
 
     @classmethod
     @override
@@ -157,6 +455,90 @@ class Voting(Scaling):
             score = cls.score_token(token, filters, len_filters)
             scores.append(score)
 
+        return cls.vote(tokens, scores, max_score)
+
+    @classmethod
+    @override
+    def score_indices(
+        cls,
+        tokens: List[str],
+        indices: List[int],
+        filters: List[Type[Filter]],
+    ) -> Number:
+        if not cls._mirrors_score("score_indices"):
+            return cls.score(tokens, filters)
+        if not tokens:
+            return 1
+
+        if len(tokens) < 4:
+            return super().score_indices(tokens, indices, filters)
+
+        len_filters = len(filters)
+        max_score = len(tokens) * len_filters
+        scores: List[Number] = [
+            len_filters - index if index >= 0 else 0 for index in indices
+        ]
+        return cls.vote(tokens, scores, max_score)
+
+    @classmethod
+    @override
+    def score_verdicts(
+        cls, verdicts: Iterable[Verdict], filters: List[Type[Filter]]
+    ) -> Optional[Number]:
+        # votes need every token at once
+        return Scorer.score_verdicts.__func__(  # type: ignore [attr-defined]
+            cls, verdicts, filters
+        )
+
+    @classmethod
+    @override
+    def passes(
+        cls,
+        verdicts: Iterable[Verdict],
+        count: int,
+        filters: List[Type[Filter]],
+        passing_score: Number,
+    ) -> Optional[bool]:
+        # a token's score depends on its neighbors, so nothing is certain
+        # until every token is judged
+        return Scorer.passes.__func__(  # type: ignore [attr-defined]
+            cls, verdicts, count, filters, passing_score
+        )
+
+    @classmethod
+    def vote(cls, tokens: List[str], scores: List[Number], max_score: int) -> Number:
+        """Replace each score at or below the threshold, if its token passes
+        `prereq`, with the average score before voting of up to 2 tokens
+        before it and 1 after it. Then total the scores.
+
+        Neighbors are summed from running totals of the scores, rather
+        than from slices of them. Since every score before voting is an
+        int, the sums and so the averages are the same either way.
+        """
+        threshold = cls.threshold
+        prereq = cls.prereq.filter
+        len_scores = len(scores)
+        sums = [0, *accumulate(scores)]
+
+        for i in [i for i, score in enumerate(scores) if score <= threshold]:
+            if not prereq(tokens[i]):
+                continue
+            start = i - 2 if i > 2 else 0
+            end = i + 2 if i + 2 < len_scores else len_scores
+            neighbors = sums[i] - sums[start] + sums[end] - sums[i + 1]
+            scores[i] = neighbors / (end - start - 1)
+
+        total_score = sum(scores)
+
+        return total_score / max_score if max_score else 0
+
+
+class VotingRef(Voting):
+    """Reference implementation for `Voting`."""
+
+    @classmethod
+    @override
+    def vote(cls, tokens: List[str], scores: List[Number], max_score: int) -> Number:
         # only consider scores from before voting
         copied_scores = scores[:]
         for i, (token, score) in enumerate(zip(tokens, copied_scores)):
@@ -165,9 +547,6 @@ class Voting(Scaling):
             if not cls.prereq.filter(token):
                 continue
 
-            # TODO: this is kinda dumb.
-            # we want to get exactly 3 neighbors, favoring 2 before and 1 after
-            # the way i'm doing this is both bad and slow as hell
             start = max(i - 2, 0)
             end = min(i + 1, len(scores) - 1)
             neighbors = copied_scores[start:i] + copied_scores[i + 1 : end + 1]
@@ -2,34 +2,69 @@
 import re
 from abc import ABC, abstractmethod
 from sys import intern
-from typing import Set, List
+from typing import Any, Set, Dict, List, Type, Tuple, Optional
 
 # PDM
-import regex
 from typing_extensions import override, deprecated
 
 # LOCAL
-from sonatoki.utils import regex_escape
-from sonatoki.Filters import NimiUCSUR  # seriously this sucks
+from sonatoki import constants
+from sonatoki.types import Span
+from sonatoki.utils import (
+    Lazy,
+    regex_escape,
+    compile_regex1,
+    compile_pattern,
+    find_unicode_ranges,
+)
 from sonatoki.constants import (
     ALL_PUNCT,
+    NIMI_UCSUR,
     INTRA_WORD_PUNCT,
     ALL_SENTENCE_PUNCT,
     UNICODE_WHITESPACE,
-    ALL_PUNCT_RANGES_STR,
     UCSUR_CARTOUCHE_LEFT,
     UCSUR_CARTOUCHE_RIGHT,
     UCSUR_MINUS_CARTOUCHE,
 )
 
-regex.DEFAULT_VERSION = regex.VERSION1
-
 
 class Tokenizer(ABC):
     @classmethod
     @abstractmethod
     def tokenize(cls, s: str) -> List[str]: ...
 
+    @classmethod
+    def spans(cls, s: str) -> List[Span]:
+        """Find the start and end of every token `tokenize` returns, as slices of
+        `s`.
+
+        By default, this searches `s` for each token in turn, so tokenizers
+        which can report their positions directly should. Raises `ValueError`
+        if a token is not found, as when `tokenize` changes its tokens.
+        """
+        spans: List[Span] = []
+        end = 0
+        for token in cls.tokenize(s):
+            start = s.find(token, end)
+            if start == -1:
+                raise ValueError(
+                    f"{cls.__name__} made {token!r}, which is not in {s!r}"
+                )
+            end = start + len(token)
+            spans.append((start, end))
+        return spans
+
+    @classmethod
+    def tokenize_spans(cls, s: str, spans: List[Span]) -> List[List[str]]:
+        """Tokenize each span of `s` on its own, as `tokenize` would tokenize
+        `s[start:end]`.
+
+        By default, this slices out each span, so tokenizers which can
+        tokenize part of a string in place should.
+        """
+        return [cls.tokenize(s[start:end]) for start, end in spans]
+
 
 class SetTokenizer(Tokenizer):
     delimiters: Set[str]
@@ -38,6 +73,10 @@ class SetTokenizer(Tokenizer):
 class RegexTokenizer(Tokenizer):
     pattern: "re.Pattern[str]"
 
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        compile_pattern(cls, re.compile)
+
     @classmethod
     @override
     def tokenize(cls, s: str) -> List[str]:
@@ -51,101 +90,175 @@ class RegexTokenizer(Tokenizer):
 class Regex1Tokenizer(Tokenizer):
     pattern: "regex.Pattern[str]"
 
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        compile_pattern(cls, compile_regex1)
+
     @classmethod
     @override
     def tokenize(cls, s: str) -> List[str]:
         return [
-            intern(clean)
-            for word in regex.split(cls.pattern, s)
-            if (clean := word.strip())
+            intern(clean) for word in cls.pattern.split(s) if (clean := word.strip())
         ]
 
 
+def word_pattern(delims: str, intra: str, glyphs: str) -> "re.Pattern[str]":
+    """Build a pattern for `WordTokenizer` from the contents of three character
+    classes, where every intra-word punctuation must also be a delimiter.
+
+    A token is one of:
+    - a run of delimiters
+    - a single glyph
+    - a run of other writing characters, each optionally followed by
+      intra-word punctuation, so long as that is followed by another
+      writing character or glyph. Otherwise, the intra-word punctuation
+      starts the next run of delimiters.
+
+    Whitespace, as `str.split` finds it, is never part of any token. Any of
+    the three classes may be empty.
+    """
+    tokens: List[str] = []
+    if delims:
+        tokens.append(rf"[{delims}]+")
+    if glyphs:
+        tokens.append(rf"[{glyphs}]")
+    word = rf"[^{delims}{glyphs}\s]"
+    if intra:
+        word += rf"(?:[{intra}](?=[^{delims}\s]))?"
+    tokens.append(rf"(?:{word})+")
+    return re.compile("|".join(tokens))
+
+
 class WordTokenizer(SetTokenizer):
+    """Split a string into words, runs of punctuation, and single UCSUR glyphs.
+
+    Rather than checking each character in Python, every character is
+    translated to a code for its class with one `str.translate`, then one
+    small regex finds every token; see `word_pattern`. Ascii strings
+    skip the translation, since their classes are small. Each subclass
+    builds its own `classes`, `pattern` and `ascii_pattern` from its own
+    characters.
+    """
+
     delimiters = set(ALL_PUNCT)
     intra_word_punct = set(INTRA_WORD_PUNCT)
+    glyphs = set(NIMI_UCSUR)
 
-    @classmethod
-    def is_delimiter(cls, c: str) -> bool:
-        return c in cls.delimiters or not c
+    # noncharacters, which are never meant to appear in text; any which do
+    # are translated to OTHER, so they are read as other writing characters
+    DELIMITER = "\ufdd0"
+    INTRA_WORD = "\ufdd1"
+    GLYPH = "\ufdd2"
+    OTHER = "\ufdd3"
+
+    classes: Dict[int, str]
+    pattern: "re.Pattern[str]"
+    ascii_pattern: "re.Pattern[str]"
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        cls._lazy_tables()
 
     @classmethod
-    def add_token(cls, s: str, tokens: List[str], last_match: int, i: int):
-        if i > last_match:
-            token = intern(s[last_match:i])
-            tokens.append(token)
+    def _lazy_tables(cls):
+        """Build `classes`, `pattern` and `ascii_pattern` from the characters
+        of `cls` the first time each is read, unless `cls` sets them
+        itself."""
+        builds = {
+            "classes": cls.class_table,
+            "pattern": cls.build_pattern,
+            "ascii_pattern": cls.build_ascii_pattern,
+        }
+        for name, build in builds.items():
+            if name not in vars(cls):
+                lazy = Lazy(build)
+                lazy.__set_name__(cls, name)
+                setattr(cls, name, lazy)
 
     @classmethod
-    def to_tokens(cls, s: str) -> List[str]:
-        tokens: List[str] = []
+    def class_table(cls) -> Dict[int, str]:
+        """Map each delimiter, intra-word punctuation and glyph to the code for
+        its class, for `str.translate`.
+
+        Other writing characters and whitespace are left as they are, except
+        the codes themselves.
+        """
+        table = {ord(c): cls.OTHER for c in (cls.DELIMITER, cls.INTRA_WORD, cls.GLYPH)}
+        table.update({ord(c): cls.DELIMITER for c in cls.delimiters if not c.isspace()})
+        table.update({ord(c): cls.INTRA_WORD for c in cls.intra_word_punct})
+        table.update({ord(c): cls.GLYPH for c in cls.glyphs})
+        return table
 
-        slen = len(s)
-        i = 0
-        did_skip = False  # ensure exists
-        while i < slen:
-
-            # contiguous punctuation chars
-            last_match = i
-            while i < slen and cls.is_delimiter(s[i]):
-                # no special case
-                i += 1
-            cls.add_token(s, tokens, last_match, i)
-
-            # contiguous writing chars (much harder)
-            last_match = i
-            while i < slen and not cls.is_delimiter(s[i]):
-                did_skip = False
-                # we skip and see another writing char, or init
-
-                if NimiUCSUR.filter(s[i]):
-                    cls.add_token(s, tokens, last_match, i)
-                    cls.add_token(s, tokens, i, i + 1)
-                    i += 1
-                    last_match = i
-                    continue
+    @classmethod
+    def build_pattern(cls) -> "re.Pattern[str]":
+        """Build the pattern which finds tokens in strings translated by
+        `classes`."""
+        intra = cls.INTRA_WORD if cls.intra_word_punct else ""
+        return word_pattern(
+            regex_escape(cls.DELIMITER + intra), regex_escape(intra), cls.GLYPH
+        )
 
-                next_char = s[i + 1] if i + 1 < slen else ""
-                if next_char in cls.intra_word_punct:
-                    did_skip = True
-                    i += 2
-                    continue
+    @classmethod
+    def build_ascii_pattern(cls) -> "re.Pattern[str]":
+        """Build the pattern which finds tokens in ascii strings, which are not
+        translated."""
+        return word_pattern(
+            regex_escape(
+                "".join(c for c in cls.delimiters if c.isascii() and not c.isspace())
+            ),
+            regex_escape("".join(c for c in cls.intra_word_punct if c.isascii())),
+            regex_escape("".join(c for c in cls.glyphs if c.isascii())),
+        )
 
-                i += 1
+    @classmethod
+    @override
+    def spans(cls, s: str) -> List[Span]:
+        if s.isascii():
+            return [match.span() for match in cls.ascii_pattern.finditer(s)]
+        codes = s.translate(cls.classes)
+        return [match.span() for match in cls.pattern.finditer(codes)]
 
-            if did_skip:
-                # we skipped, but there wasn't another writing character
-                cls.add_token(s, tokens, last_match, i - 1)
-                last_match = i - 1
-                # there may be punctuation though
-                # TODO: this is duplicated
-                while i < slen and cls.is_delimiter(s[i]):
-                    i += 1
+    @classmethod
+    @override
+    def tokenize_spans(cls, s: str, spans: List[Span]) -> List[List[str]]:
+        if not s.isascii():
+            # slices may be ascii even if `s` is not, which is much faster
+            return [cls.to_tokens(s[start:end]) for start, end in spans]
+
+        # the pattern has no anchors or lookbehinds, so matching within
+        # `pos` and `endpos` is the same as matching a slice
+        findall = cls.ascii_pattern.findall
+        return [
+            [intern(token) for token in findall(s, start, end)] for start, end in spans
+        ]
 
-            cls.add_token(s, tokens, last_match, i)
+    @classmethod
+    def to_tokens(cls, s: str) -> List[str]:
+        if s.isascii():
+            return [intern(token) for token in cls.ascii_pattern.findall(s)]
 
-        return tokens
+        codes = s.translate(cls.classes)
+        return [
+            intern(s[match.start() : match.end()])
+            for match in cls.pattern.finditer(codes)
+        ]
 
     @classmethod
     @override
     def tokenize(cls, s: str) -> List[str]:
-        if not s:
-            return []
-
-        tokens: List[str] = []
-        candidates: List[str] = s.split()
+        return cls.to_tokens(s)
 
-        for candidate in candidates:
-            results = cls.to_tokens(candidate)
-            tokens.extend(results)
 
-        return tokens
+WordTokenizer._lazy_tables()
 
 
 @deprecated(
     "WordTokenizerRe is a previous reference implementation. Its behavior has diverged from WordTokenizer and it may not be restored."
 )
 class WordTokenizerRe(RegexTokenizer):
-    pattern = re.compile(rf"""([{ALL_PUNCT_RANGES_STR}]+|\s+)""")
+    pattern = Lazy(
+        lambda: re.compile(rf"""([{constants.ALL_PUNCT_RANGES_STR}]+|\s+)""")
+    )
 
 
 @deprecated(
@@ -154,26 +267,54 @@ class WordTokenizerRe(RegexTokenizer):
 class WordTokenizerRe1(Regex1Tokenizer):
     """Reference implementation for WordTokenizer."""
 
-    pattern = regex.compile(r"""([\p{posix_punct}\p{Punctuation}]+|\s+)""")
+    pattern = Lazy(
+        lambda: compile_regex1(r"""([\p{posix_punct}\p{Punctuation}]+|\s+)""")
+    )
+
+
+def strip_span(s: str, start: int, end: int) -> Optional[Span]:
+    """Find the span of `s[start:end].strip()` in `s`, or `None` if it is
+    empty."""
+    part = s[start:end]
+    stripped = part.lstrip()
+    if not stripped:
+        return None
+    start += len(part) - len(stripped)
+    return start, start + len(stripped.rstrip())
 
 
 class SentTokenizer(SetTokenizer):
     delimiters: Set[str] = set(ALL_SENTENCE_PUNCT + "\n")  # regex does \n with a flag
     intra_word_punct: Set[str] = set(INTRA_WORD_PUNCT)
     all_punct: Set[str] = set(ALL_PUNCT + UNICODE_WHITESPACE)
+    # the only characters where a sentence may end, so the rest are skipped
+    candidates = Lazy(
+        lambda: re.compile(
+            "["
+            + regex_escape("".join(SentTokenizer.delimiters) + UCSUR_CARTOUCHE_LEFT)
+            + "]"
+        )
+    )
 
     @classmethod
     @override
     def tokenize(cls, s: str) -> List[str]:
+        return [s[start:end] for start, end in cls.spans(s)]
+
+    @classmethod
+    @override
+    def spans(cls, s: str) -> List[Span]:
         if not s:
             return []
 
-        tokens: List[str] = []
+        spans: List[Span] = []
 
         slen = len(s)
         last_match = 0
-        i = 0
-        while i < slen:
+        search = cls.candidates.search
+        match = search(s)
+        while match:
+            i = match.start()
             # if a cartouche appears, we do not want to split on its punctuation
             if s[i] == UCSUR_CARTOUCHE_LEFT:
                 right_i = s.find(UCSUR_CARTOUCHE_RIGHT, i)
@@ -182,10 +323,10 @@ class SentTokenizer(SetTokenizer):
                     contained = set(s[i + 1 : right_i])
                 # but it must contain only non-cartouche UCSUR chars
                 if contained and contained.issubset(UCSUR_MINUS_CARTOUCHE):
-                    i = right_i + 1
+                    match = search(s, right_i + 1)
                     continue
             if s[i] not in cls.delimiters:
-                i += 1
+                match = search(s, i + 1)
                 continue
             if s[i] in cls.intra_word_punct:
                 prev = s[i - 1] if i > 0 else ""
@@ -196,22 +337,20 @@ class SentTokenizer(SetTokenizer):
                     and prev not in cls.all_punct
                     and next not in cls.all_punct
                 ):
-                    i += 2
+                    match = search(s, i + 2)
                     continue
 
-            match = s[last_match : i + 1].strip()
+            span = strip_span(s, last_match, i + 1)
             last_match = i + 1  # newlines can strip but idc
-            if not match:
-                i += 1
-                continue
-            tokens.append(match)
-            i += 1
+            if span:
+                spans.append(span)
+            match = search(s, i + 1)
 
-        match = s[last_match:].strip()
-        if match:
-            tokens.append(match)
+        span = strip_span(s, last_match, slen)
+        if span:
+            spans.append(span)
 
-        return tokens
+        return spans
 
 
 @deprecated(
@@ -230,11 +369,38 @@ class SentTokenizerRe(RegexTokenizer):
     "SentTokenizerRe1 is a previous reference implementation. Its behavior has diverged from SentTokenizer and it may not be restored."
 )
 class SentTokenizerRe1(Regex1Tokenizer):
-    pattern = regex.compile(
-        rf"""(?<=[{regex_escape(ALL_SENTENCE_PUNCT)}]|$)""", flags=regex.MULTILINE
+    pattern = Lazy(
+        lambda: compile_regex1(
+            rf"""(?<=[{regex_escape(ALL_SENTENCE_PUNCT)}]|$)""", flags=re.MULTILINE
+        )
     )
 
 
+def reports_spans(tokenizer: Type[Tokenizer]) -> bool:
+    """Whether `tokenizer` finds its own spans, rather than searching for
+    its tokens with the default `Tokenizer.spans`."""
+    return tokenizer.spans.__func__ is not Tokenizer.spans.__func__  # type: ignore [attr-defined]
+
+
+def tokenize_sentences(
+    s: str, sent_tokenizer: Type[Tokenizer], word_tokenizer: Type[Tokenizer]
+) -> List[Tuple[str, List[str]]]:
+    """Split `s` into sentences with `sent_tokenizer`, paired with the words
+    `word_tokenizer` finds in each.
+
+    Sentence tokenizers which do not report their own spans are only asked
+    for their sentences, which need not be slices of `s`.
+    """
+    if not reports_spans(sent_tokenizer):
+        return [
+            (sentence, word_tokenizer.tokenize(sentence))
+            for sentence in sent_tokenizer.tokenize(s)
+        ]
+    spans = sent_tokenizer.spans(s)
+    words = word_tokenizer.tokenize_spans(s, spans)
+    return [(s[start:end], tokens) for (start, end), tokens in zip(spans, words)]
+
+
 __all__ = [
     "WordTokenizer",
     "SentTokenizer",
@@ -1,27 +1,18 @@
 #!/bin/env python3
 # STL
 import os
+import sys
 import json
+import time
 import argparse
-from typing import Any, Set, Dict, List
-
-# PDM
-import emoji
-import requests
+from typing import Any, Set, Dict, List, Iterator
 
 # LOCAL
-from sonatoki.utils import find_unicode_ranges
-from sonatoki.Filters import (
-    Or,
-    LongSyllabic,
-    NimiLinkuCore,
-    LongAlphabetic,
-    NimiLinkuCommon,
-    NimiLinkuObscure,
-    NimiLinkuUncommon,
-)
+from sonatoki.types import Number, LinkuWord, LexiconEntry
+from sonatoki.utils import read_messages, parse_messages, find_unicode_ranges
 from sonatoki.Cleaners import ConsecutiveDuplicates
 from sonatoki.constants import (
+    LEXICON,
     UCSUR_PUNCT_RANGES,
     UNICODE_PUNCT_RANGES,
     UNICODE_WHITESPACE_RANGES,
@@ -47,6 +38,10 @@ HEADERS = {  # pretend to be Chrome 121, just in case
 
 
 def download(url: str) -> str:
+    # only needed to regenerate data, so it is not a dependency of the library
+    # PDM
+    import requests
+
     if not url.startswith("https://"):
         raise ValueError(url)
 
@@ -59,17 +54,53 @@ def download_json(url: str) -> Dict[str, Any]:
     return json.loads(resp)
 
 
-def regen_linku_data():
-    data = download_json(LINKU_WORDS)
-    with open(os.path.join(HERE, "linku.json"), "w", encoding="utf-8") as f:
-        _ = f.write(json.dumps(data))
+def compact_linku_data(*datasets: Dict[str, LinkuWord]) -> List[LexiconEntry]:
+    """Merge Linku API dumps, keeping only the fields the library reads.
+
+    Later datasets override earlier ones for words with the same id.
+    """
+    merged: Dict[str, LinkuWord] = {}
+    for data in datasets:
+        merged.update(data)
 
-    data = download_json(LINKU_SANDBOX)
-    with open(os.path.join(HERE, "sandbox.json"), "w", encoding="utf-8") as f:
-        _ = f.write(json.dumps(data))
+    entries: List[LexiconEntry] = [
+        {
+            "word": word["word"],
+            "book": word["book"],
+            "usage_category": word["usage_category"],
+            "usage": word["usage"],
+        }
+        for word in merged.values()
+    ]
+    return sorted(entries, key=lambda e: (e["word"], e["usage_category"]))
+
+
+def write_lexicon(entries: List[LexiconEntry]):
+    # one entry per line so updates make readable diffs
+    lines = [json.dumps(entry, ensure_ascii=False) for entry in entries]
+    with open(LEXICON, "w", encoding="utf-8") as f:
+        _ = f.write("[\n" + ",\n".join(lines) + "\n]\n")
+
+
+def regen_linku_data():
+    linku = download_json(LINKU_WORDS)
+    sandbox = download_json(LINKU_SANDBOX)
+    write_lexicon(compact_linku_data(linku, sandbox))
 
 
 def regen_false_negatives():
+    # imported here to read the lexicon `regen_linku_data` just wrote
+    # LOCAL
+    from sonatoki.Filters import (
+        Or,
+        LongSyllabic,
+        NimiLinkuCore,
+        LongAlphabetic,
+        NimiLinkuCommon,
+        NimiLinkuObscure,
+        NimiLinkuUncommon,
+    )
+
     # TODO: regen from my frequency data where the score is below 0.8?
     KnownWords = Or(
         NimiLinkuCore,
@@ -107,6 +138,9 @@ def regen_false_negatives():
 
 
 def regen_unicode_data():
+    # PDM
+    import emoji  # deferred because it is slow to import
+
     PUNCT_CATEGORIES = {
         # Punctuation
         "Pc",  # Connector
@@ -190,16 +224,164 @@ def regen_unicode_data():
             f.write(output)
 
 
-def main(argv: argparse.Namespace):
+def read_inputs(
+    paths: List[str], field: str, parser: argparse.ArgumentParser
+) -> Iterator[str]:
+    """Yield every message in each file in turn, where "-" is stdin.
+
+    A message which cannot be read is reported as an error with `parser`.
+    """
+    for path in paths:
+        try:
+            if path == "-":
+                sys.stdin.reconfigure(newline="\n")  # type: ignore [union-attr]
+                yield from parse_messages(sys.stdin, field or None, "<stdin>")
+            else:
+                yield from read_messages(path, field or None)
+        except ValueError as e:
+            parser.error(str(e))
+
+
+def score(argv: argparse.Namespace):
+    # imported here so that `regen` can run while the lexicon is broken
+    # LOCAL
+    from sonatoki import Configs
+    from sonatoki.ilo import Ilo
+
+    parser: argparse.ArgumentParser = argv.parser
+    configs = sorted(
+        name
+        for name, value in vars(Configs).items()
+        if name.endswith("Config") and isinstance(value, dict)
+    )
+    if argv.config not in configs:
+        parser.error(
+            f"argument --config: invalid choice: {argv.config!r} "
+            f"(choose from {', '.join(configs)})"
+        )
+    for path in argv.inputs:
+        if path == "-":
+            continue
+        try:
+            open(path, "rb").close()
+        except OSError as e:
+            parser.error(f"can't open {path!r}: {e.strerror}")
+    if argv.workers < 0:
+        parser.error("argument --workers: must be at least 0")
+    if argv.chunksize < 1:
+        parser.error("argument --chunksize: must be at least 1")
+
+    config: Configs.IloConfig = getattr(Configs, argv.config)
+    ilo = Ilo(**config)
+    passing_score = config["passing_score"]
+    messages = read_inputs(argv.inputs, argv.field, parser)
+
+    results: Iterator[Any]
+    if argv.scorecards:
+        if argv.workers == 1:
+            results = ilo.stream_scorecards(messages)
+        else:
+            results = ilo._stream_parallel(
+                "make_scorecard_many", messages, argv.workers or None, argv.chunksize
+            )
+    else:
+        if argv.workers == 1:
+            results = ilo._score_many(messages)
+        else:
+            results = ilo._stream_parallel(
+                "score_many", messages, argv.workers or None, argv.chunksize
+            )
+
+    output = sys.stdout
+    if argv.output != "-":
+        try:
+            output = open(argv.output, "w", encoding="utf-8")
+        except OSError as e:
+            parser.error(f"can't open {argv.output!r}: {e.strerror}")
+
+    count = 0
+    passing = 0
+    start = time.perf_counter()
+    with output:
+        for result in results:
+            value: Number = result["score"] if argv.scorecards else result
+            record = {"score": value, "toki_pona": value >= passing_score}
+            if argv.scorecards:
+                record = {**result, **record}
+            passing += record["toki_pona"]
+            count += 1
+            _ = output.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"scored {count} messages, {passing} passing, in {elapsed:.2f}s "
+        f"({count / elapsed if elapsed else 0:.0f} messages/s)",
+        file=sys.stderr,
+    )
+
+
+def regen(argv: argparse.Namespace):
     regen_unicode_data()
     regen_linku_data()
     regen_false_negatives()
 
 
-if __name__ == "__main__":
-    """Helper script to fetch UNICODE_PUNCT in constants.py."""
-    parser = argparse.ArgumentParser()
+def main():
+    parser = argparse.ArgumentParser(prog="python -m sonatoki")
+    parser.set_defaults(run=regen)
+    commands = parser.add_subparsers(title="commands")
+
+    regen_parser = commands.add_parser(
+        "regen",
+        help="fetch Unicode and Linku data to regenerate the packaged data (default)",
+    )
+    regen_parser.set_defaults(run=regen)
+
+    score_parser = commands.add_parser(
+        "score",
+        help="score messages, writing one JSON result per message in input order",
+    )
+    score_parser.set_defaults(run=score, parser=score_parser)
+    score_parser.add_argument(
+        "inputs",
+        nargs="*",
+        default=["-"],
+        help="files with one message per line, optionally gzipped; - or none for stdin",
+    )
+    score_parser.add_argument(
+        "--field",
+        default="",
+        help="read each line as a JSON object with its message under this key",
+    )
+    score_parser.add_argument(
+        "--config",
+        default="PrefConfig",
+        help="name of a config in sonatoki.Configs (default: PrefConfig)",
+    )
+    score_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of processes to score with; 0 for one per CPU (default: 1)",
+    )
+    score_parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=1024,
+        help="messages sent to a worker at once (default: 1024)",
+    )
+    score_parser.add_argument(
+        "--scorecards",
+        action="store_true",
+        help="write the full scorecard of each message, not just its score",
+    )
+    score_parser.add_argument(
+        "--output", default="-", help="file to write results to; - for stdout"
+    )
 
-    # TODO: choice between regen unicode data, regen linku, regen english phonomatches
     argv = parser.parse_args()
-    main(argv)
+    argv.run(argv)
+
+
+if __name__ == "__main__":
+    main()
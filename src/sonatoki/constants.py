@@ -1,10 +1,10 @@
 # STL
 import json
-from typing import Set, Dict, Optional
+from typing import Any, Set, Dict, List, Callable, Optional
 from pathlib import Path
 
 # LOCAL
-from sonatoki.types import LinkuWord, LinkuUsageDate
+from sonatoki.types import LinkuIndex, LexiconEntry, LinkuUsageDate
 from sonatoki.utils import find_unicode_chars, find_unicode_ranges
 
 LATEST_DATE = "2025-09"
@@ -509,8 +509,7 @@ POSIX_PUNCT = r"""-!"#$%&'()*+,./:;<=>?@[\]^_`{|}~"""
 POSIX_PUNCT_RANGES = find_unicode_ranges(POSIX_PUNCT)
 
 ALL_PUNCT = "".join(sorted(list(set(POSIX_PUNCT + UNICODE_PUNCT))))
-ALL_PUNCT_RANGES_STR = "".join(find_unicode_ranges(ALL_PUNCT))
-# combined bc the result could be simpler
+# ALL_PUNCT_RANGES_STR is built on first use; see `__getattr__`
 
 UNICODE_WHITESPACE_RANGES = [
     "\\U00000009",  # tab
@@ -563,8 +562,7 @@ ALL_SENTENCE_PUNCT = BASIC_SENTENCE_PUNCT + UCSUR_SENTENCE_PUNCT
 INTRA_WORD_PUNCT = """-'’._‍"""  # ZWJ at the end
 
 
-LINKU = Path(__file__).resolve().parent / Path("linku.json")
-SANDBOX = Path(__file__).resolve().parent / Path("sandbox.json")
+LEXICON = Path(__file__).resolve().parent / Path("lexicon.json")
 SYLLABICS = Path(__file__).resolve().parent / Path("syllabic.txt")
 ALPHABETICS = Path(__file__).resolve().parent / Path("alphabetic.txt")
 
@@ -877,45 +875,92 @@ EMOTICONS = [
 ]
 
 
-def linku_data() -> Dict[str, LinkuWord]:
-    # NOTE: this does open+read+parse two files each time you construct a filter
-    # but i expect users to construct filters only at the start of runtime
-    # there is no reason to waste your RAM by leaving the linku data in it
-    with open(LINKU, "r", encoding="utf-8") as f:
-        linku: Dict[str, LinkuWord] = json.loads(f.read())
-    with open(SANDBOX, "r", encoding="utf-8") as f:
-        sandbox: Dict[str, LinkuWord] = json.loads(f.read())
+def linku_data() -> List[LexiconEntry]:
+    """Read the lexicon compiled from Linku's words and sandbox by
+    `python -m sonatoki`.
 
-    return {**linku, **sandbox}
+    NOTE: this opens and parses the lexicon each time it is called.
+    Prefer `linku_index`, which only calls this once per process.
+    """
+    with open(LEXICON, "r", encoding="utf-8") as f:
+        return json.loads(f.read())
+
+
+INDEXED_TAGS = ("book", "usage_category")
+_linku_index: Optional[LinkuIndex] = None
+
+
+def build_linku_index(data: List[LexiconEntry]) -> LinkuIndex:
+    index: LinkuIndex = {
+        "words": set(),
+        "tags": {tag: {} for tag in INDEXED_TAGS},
+        "usage": {},
+    }
+    for entry in data:
+        word = entry["word"]
+        index["words"].add(word)
+        for tag in INDEXED_TAGS:
+            index["tags"][tag].setdefault(entry[tag], set()).add(word)
+        for date, usage in entry["usage"].items():
+            by_date = index["usage"].setdefault(date, {})
+            by_date[word] = max(usage, by_date.get(word, usage))
+    return index
+
+
+def linku_index() -> LinkuIndex:
+    """Return the index of Linku's words, reading Linku's data to build it
+    only the first time this is called in a process."""
+    global _linku_index
+    if _linku_index is None:
+        _linku_index = build_linku_index(linku_data())
+    return _linku_index
+
+
+def drop_linku_index():
+    """Release the index built by `linku_index`.
+
+    Filters copy the words they need when they are built, so this is
+    safe to call once you are done building filters. The index is
+    rebuilt if it is needed again.
+    """
+    global _linku_index
+    _linku_index = None
 
 
 def words_by_tag(tag: str, value: str) -> Set[str]:
-    data = linku_data()
-    return {d["word"] for d in data.values() if d[tag] == value}
+    return set(linku_index()["tags"][tag].get(value, ()))
 
 
 def words_by_usage(
     usage: int,
     date: Optional[LinkuUsageDate] = None,
 ) -> Set[str]:
+    index = linku_index()
+    if usage == 0:
+        return set(index["words"])
+
     if not date:
         date = LATEST_DATE
-    data = linku_data()
+    usages = index["usage"].get(date, {})
+    return {word for word, word_usage in usages.items() if word_usage >= usage}
 
-    result: Set[str] = set()
-    for word in data.values():
-        if usage == 0:
-            result.add(word["word"])
-            continue
 
-        usages = word["usage"]
-        if date in usages and usages[date] >= usage:
-            result.add(word["word"])
+NIMI_PU_SYNONYMS = {"namako", "kin", "oko"}
 
-    return result
 
+__LAZY_CONSTANTS: Dict[str, Callable[[], Any]] = {
+    # combined bc the result could be simpler
+    "ALL_PUNCT_RANGES_STR": lambda: "".join(find_unicode_ranges(ALL_PUNCT)),
+}
 
-NIMI_PU_SYNONYMS = {"namako", "kin", "oko"}
+
+def __getattr__(name: str) -> Any:
+    """Build constants which are slow to build and only needed by some
+    filters or tokenizers the first time they are read."""
+    if name in __LAZY_CONSTANTS:
+        value = globals()[name] = __LAZY_CONSTANTS[name]()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # with open(SYLLABICS, "r", encoding="utf-8") as f:
@@ -1,13 +1,64 @@
 # STL
-from typing import List, Type
+import os
+from typing import (
+    Any,
+    Set,
+    Dict,
+    List,
+    Type,
+    Deque,
+    Tuple,
+    Literal,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    overload,
+)
+from functools import partial, lru_cache
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 
 # LOCAL
-from sonatoki.types import Number, Scorecard
-from sonatoki.Filters import Filter
+from sonatoki.types import (
+    Span,
+    Number,
+    Verdict,
+    CacheInfo,
+    Scorecard,
+    ScoreBatch,
+    AnyScorecard,
+    CompactScorecard,
+)
+from sonatoki.utils import Stats, batched
+from sonatoki.Filters import Filter, filter_caches, compile_filter, compile_classifier
 from sonatoki.Scorers import Scorer, SentNoOp, SentenceScorer
-from sonatoki.Cleaners import Cleaner
-from sonatoki.Tokenizers import Tokenizer, SentTokenizer, WordTokenizer
-from sonatoki.Preprocessors import Preprocessor
+from sonatoki.Cleaners import Cleaner, compile_cleaners
+from sonatoki.Tokenizers import (
+    Tokenizer,
+    SentTokenizer,
+    WordTokenizer,
+    reports_spans,
+)
+from sonatoki.Preprocessors import (
+    Offsets,
+    Preprocessor,
+    compile_preprocessors,
+    preprocess_with_offsets,
+)
+
+_worker_ilo: Optional["Ilo"] = None
+
+
+def _init_worker(ilo: "Ilo"):
+    global _worker_ilo
+    _worker_ilo = ilo
+
+
+def _run_in_worker(method: str, messages: List[str], **kwargs: Any) -> List[object]:
+    assert _worker_ilo is not None, "Worker was not initialized with an Ilo"
+    return getattr(_worker_ilo, method)(messages, **kwargs)
 
 
 class Ilo:
@@ -21,6 +72,26 @@ class Ilo:
     __sentence_scorer: Type[SentenceScorer]
     __passing_score: Number
     __empty_passes: bool
+    __verdict_cache_size: Optional[int]
+    __stats: Optional[Stats]
+    __verdict: Any  # lru_cache of __judge
+    __preprocess: Callable[[str], str]
+    __sent_tokenize: Callable[[str], List[str]]
+    __sent_spans: Callable[[str], List[Span]]
+    __sent_reports_spans: bool
+    __word_tokenize: Callable[[str], List[str]]
+    __tokenize_spans: Callable[[str, List[Span]], List[List[str]]]
+    __ignore: Callable[[str], bool]
+    __clean: Callable[[str], str]
+    __classify: Callable[[str], int]
+    __score: Callable[[List[str], List[Type[Filter]]], Number]
+    __score_indices: Callable[[List[str], List[int], List[Type[Filter]]], Number]
+    __score_verdicts: Callable[
+        [Iterable[Verdict], List[Type[Filter]]], Optional[Number]
+    ]
+    __passes: Callable[
+        [Iterable[Verdict], int, List[Type[Filter]], Number], Optional[bool]
+    ]
 
     def __init__(
         self,
@@ -34,6 +105,8 @@ class Ilo:
         sentence_scorer: Type[SentenceScorer] = SentNoOp,
         word_tokenizer: Type[Tokenizer] = WordTokenizer,
         sent_tokenizer: Type[Tokenizer] = SentTokenizer,
+        verdict_cache_size: Optional[int] = 2**16,
+        stats: Optional[Stats] = None,
     ):
         super().__init__()
         # avoid keeping a ref to user's list just in case
@@ -47,24 +120,130 @@ class Ilo:
         self.__sentence_scorer = sentence_scorer
         self.__passing_score = passing_score
         self.__empty_passes = empty_passes
+        self.__verdict_cache_size = verdict_cache_size
+        self.__stats = stats
+        self.__compile()
+
+    def __compile(self):
+        # compiled filters are closures, and the cache holds a ref to self,
+        # so these are rebuilt rather than pickled
+        self.__preprocess = compile_preprocessors(self.__preprocessors)
+        self.__sent_tokenize = self.__sent_tokenizer.tokenize
+        self.__sent_spans = self.__sent_tokenizer.spans
+        self.__sent_reports_spans = reports_spans(self.__sent_tokenizer)
+        self.__word_tokenize = self.__word_tokenizer.tokenize
+        self.__tokenize_spans = self.__word_tokenizer.tokenize_spans
+        self.__ignore = compile_filter(*self.__ignoring_filters)
+        self.__clean = compile_cleaners(self.__cleaners)
+        self.__classify = compile_classifier(self.__scoring_filters)
+        self.__score = self.__scorer.score
+        self.__score_indices = self.__scorer.score_indices
+        self.__score_verdicts = self.__scorer.score_verdicts
+        self.__passes = self.__scorer.passes
+        if self.__stats is not None:
+            self.__instrument(self.__stats)
+        self.__verdict = lru_cache(maxsize=self.__verdict_cache_size)(self.__judge)
+
+    def __instrument(self, stats: Stats):
+        # every filter is called on its own, rather than compiled, so that
+        # each one's time can be told apart
+        timed = stats.timed
+        self.__preprocess = timed(
+            "preprocess", compile_preprocessors(self.__preprocessors, wrap=timed)
+        )
+        self.__sent_tokenize = timed("sent_tokenize", self.__sent_tokenize)
+        self.__sent_spans = timed("sent_tokenize", self.__sent_spans)
+        self.__word_tokenize = timed("word_tokenize", self.__word_tokenize)
+        self.__tokenize_spans = timed("word_tokenize", self.__tokenize_spans)
+        self.__clean = timed("clean", compile_cleaners(self.__cleaners, wrap=timed))
+        self.__score = timed("score", self.__score)
+        self.__score_indices = timed("score", self.__score_indices)
+        self.__score_verdicts = timed("score", self.__score_verdicts)
+        self.__passes = timed("score", self.__passes)
+
+        ignoring = [timed(f, f.filter) for f in self.__ignoring_filters]
+        scoring = [timed(f, f.filter) for f in self.__scoring_filters]
+
+        def ignore(token: str) -> bool:
+            for f in ignoring:
+                if f(token):
+                    return True
+            return False
+
+        def classify(token: str) -> int:
+            for i, f in enumerate(scoring):
+                if f(token):
+                    return i
+            return -1
+
+        self.__ignore = timed("filter", ignore)
+        self.__classify = timed("classify", classify)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for name in (
+            "_Ilo__preprocess",
+            "_Ilo__sent_tokenize",
+            "_Ilo__sent_spans",
+            "_Ilo__word_tokenize",
+            "_Ilo__tokenize_spans",
+            "_Ilo__ignore",
+            "_Ilo__clean",
+            "_Ilo__classify",
+            "_Ilo__score",
+            "_Ilo__score_indices",
+            "_Ilo__score_verdicts",
+            "_Ilo__passes",
+            "_Ilo__verdict",
+        ):
+            del state[name]
+        # the stats would be recorded in the copy, where nobody can read them
+        state["_Ilo__stats"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self.__compile()
+
+    @property
+    def stats(self) -> Optional[Stats]:
+        """The `Stats` this `Ilo` records into, if it was made with one.
+
+        Stats are not recorded by copies of this `Ilo`, such as those
+        sent to workers by `map_parallel`.
+        """
+        return self.__stats
 
     def preprocess(self, msg: str) -> str:
-        for p in self.__preprocessors:
-            msg = p.process(msg)
-        return msg
+        return self.__preprocess(msg)
+
+    def preprocess_with_offsets(self, msg: str) -> Tuple[str, Offsets]:
+        """Preprocess `msg`, also returning the `Offsets` which map spans of the
+        result back to spans of `msg`.
+
+        Slower than `ilo.preprocess`, so only worth using for the positions.
+        """
+        return preprocess_with_offsets(self.__preprocessors, msg)
 
     def word_tokenize(self, msg: str) -> List[str]:
         """It is *highly* recommended that you run `ilo.preprocess` first."""
-        return self.__word_tokenizer.tokenize(msg)
+        return self.__word_tokenize(msg)
+
+    def word_spans(self, msg: str) -> List[Span]:
+        """The start and end of each token `ilo.word_tokenize` would return."""
+        return self.__word_tokenizer.spans(msg)
 
     def sent_tokenize(self, msg: str) -> List[str]:
         """It is *highly* recommended that you run `ilo.preprocess` first."""
-        return self.__sent_tokenizer.tokenize(msg)
+        return self.__sent_tokenize(msg)
+
+    def sent_spans(self, msg: str) -> List[Span]:
+        """The start and end of each sentence `ilo.sent_tokenize` would
+        return."""
+        return self.__sent_tokenizer.spans(msg)
 
     def clean_token(self, token: str) -> str:
-        for c in self.__cleaners:
-            token = c.clean(token)
-        return token
+        return self.__clean(token)
 
     def clean_tokens(self, tokens: List[str]) -> List[str]:
         # NOTE: tested, making a new list with a for loop *is* faster than:
@@ -79,10 +258,26 @@ class Ilo:
         return cleaned_tokens
 
     def _filter_token(self, token: str) -> bool:
-        for f in self.__ignoring_filters:
-            if f.filter(token):
-                return True
-        return False
+        return self.__ignore(token)
+
+    def __judge(self, token: str) -> Verdict:
+        if self.__ignore(token):
+            return Verdict(True, "", -1)
+
+        cleaned = self.__clean(token)
+        if not cleaned:
+            return Verdict(False, cleaned, -1)
+        return Verdict(False, cleaned, self.__classify(cleaned))
+
+    def verdict(self, token: str) -> Verdict:
+        """Decide whether a token is ignored, how it is cleaned, and which
+        scoring filter it matches first.
+
+        Verdicts are remembered per `Ilo`, up to `verdict_cache_size`
+        distinct tokens, so a repeated token costs one cache lookup
+        regardless of how many filters it would have to pass through.
+        """
+        return self.__verdict(token)
 
     def filter_tokens(self, tokens: List[str]) -> List[str]:
         filtered_tokens: List[str] = []
@@ -95,27 +290,55 @@ class Ilo:
         return filtered_tokens
 
     def score_tokens(self, tokens: List[str]) -> float:
-        return self.__scorer.score(tokens, self.__scoring_filters)
+        return self.__score(tokens, self.__scoring_filters)
 
     def score_sentences(self, scorecards: List[Scorecard]) -> List[Scorecard]:
         return self.__sentence_scorer.score(scorecards)
 
-    def _is_toki_pona(self, message: str) -> Scorecard:
+    def _is_toki_pona(self, message: str, compact: bool = False) -> Scorecard:
         """Process a message into its tokens, then filters, cleans, and scores
         them. Message must already be preprocessed, normally done in
         `self.is_toki_pona(message)`.
 
-        Returns a `Scorecard` with all changes to the input text and a score.
+        Returns a `Scorecard` with all changes to the input text and a score,
+        or a `CompactScorecard` if `compact`.
         """
-        tokenized = self.word_tokenize(message)
-        filtered = self.filter_tokens(tokenized)
-        cleaned = self.clean_tokens(filtered)
-        score = self.score_tokens(cleaned)
+        return self.__score_tokenized(message, self.word_tokenize(message), compact)
+
+    def __score_tokenized(
+        self, message: str, tokenized: List[str], compact: bool = False
+    ) -> Scorecard:
+        """Filter, clean, and score the tokens of a message."""
+        filtered: List[str] = []
+        cleaned: List[str] = []
+        indices: List[int] = []
+        verdict = self.__verdict
+        for token in tokenized:
+            ignored, cleaned_token, index = verdict(token)
+            if ignored:
+                continue
+            filtered.append(token)
+            if not cleaned_token:
+                continue
+            cleaned.append(cleaned_token)
+            indices.append(index)
+
+        score = self.__score_indices(cleaned, indices, self.__scoring_filters)
         if not self.__empty_passes and not cleaned:
             # NOTE: filtered will already be empty
             # but clean_tokens can *technically* omit tokens too
             score = 0
 
+        if compact:
+            # share a list wherever nothing changed, since these are often
+            # identical and CompactScorecard is read-only but for its score
+            if len(filtered) == len(tokenized):
+                filtered = tokenized
+            if cleaned == filtered:
+                cleaned = filtered
+            return CompactScorecard(  # type: ignore [return-value]
+                message, tokenized, filtered, cleaned, score
+            )
         scorecard: Scorecard = {
             "text": message,
             "tokenized": tokenized,
@@ -132,12 +355,74 @@ class Ilo:
         message = self.preprocess(message)
         return self._is_toki_pona(message)
 
+    def _passes(self, message: str) -> bool:
+        """Decide whether a message is Toki Pona, as `self._is_toki_pona` would,
+        but without building a `Scorecard`. Message must already be
+        preprocessed, normally done in `self.is_toki_pona(message)`.
+
+        Tokens are judged one at a time, and the scorer may stop once no
+        remaining token could change the result. For example, a long
+        English message fails as soon as enough of it has failed.
+        """
+        return self.__decide(self.__word_tokenize(message))
+
+    def __decide(self, tokenized: List[str]) -> bool:
+        passed = self.__passes(
+            map(self.__verdict, tokenized),
+            len(tokenized),
+            self.__scoring_filters,
+            self.__passing_score,
+        )
+        if passed is None:
+            return self.__empty_score() >= self.__passing_score
+        return passed
+
+    def __empty_score(self) -> Number:
+        """The score of a message with no tokens left after cleaning."""
+        if not self.__empty_passes:
+            return 0
+        return self.__score_indices([], [], self.__scoring_filters)
+
+    def _score(self, message: str) -> Number:
+        """Score a message as `self._is_toki_pona` would, but without building
+        a `Scorecard`. Message must already be preprocessed, normally done
+        in `self.score(message)`.
+
+        Each token is filtered, cleaned, and scored as it is read, so no
+        list of tokens is kept between those steps.
+        """
+        score = self.__score_verdicts(
+            map(self.__verdict, self.__word_tokenize(message)),
+            self.__scoring_filters,
+        )
+        if score is None:
+            return self.__empty_score()
+        return score
+
+    def score(self, message: str) -> Number:
+        """Preprocess and score a message. The same as
+        `self.make_scorecard(message)["score"]`, but faster."""
+        return self._score(self.preprocess(message))
+
     def is_toki_pona(self, message: str) -> bool:
         """Determines whether a text is or is not Toki Pona."""
-        scorecard = self.make_scorecard(message)
-        return scorecard["score"] >= self.__passing_score
+        return self._passes(self.preprocess(message))
+
+    def __tokenize_sentences(self, message: str) -> List[Tuple[str, List[str]]]:
+        # same as `tokenize_sentences`, but each half is timed separately
+        if not self.__sent_reports_spans:
+            sentences = self.__sent_tokenize(message)
+            return [
+                (sentence, self.__word_tokenize(sentence)) for sentence in sentences
+            ]
+
+        spans = self.__sent_spans(message)
+        words = self.__tokenize_spans(message, spans)
+        return [
+            (message[start:end], tokens) for (start, end), tokens in zip(spans, words)
+        ]
 
-    def _are_toki_pona(self, message: str) -> List[Scorecard]:
+    def _are_toki_pona(self, message: str, compact: bool = False) -> List[Scorecard]:
         """Split a message into sentences, then return a list with each
         sentence's scorecard from `self._is_toki_pona()`.
 
@@ -145,8 +430,8 @@ class Ilo:
         `self.are_toki_pona(message)`.
         """
         scorecards: List[Scorecard] = list()
-        for sentence in self.sent_tokenize(message):
-            result = self._is_toki_pona(sentence)
+        for sentence, tokenized in self.__tokenize_sentences(message):
+            result = self.__score_tokenized(sentence, tokenized, compact)
             scorecards.append(result)
         scorecards = self.score_sentences(scorecards)
         return scorecards
@@ -173,5 +458,280 @@ class Ilo:
         ```
         """
         message = self.preprocess(message)
+        if self.__sentence_scorer is SentNoOp:
+            # each sentence is decided alone, so none needs a scorecard
+            sentences = self.__tokenize_sentences(message)
+            return [self.__decide(tokenized) for _, tokenized in sentences]
+
         scorecards = self._are_toki_pona(message)
         return [card["score"] >= self.__passing_score for card in scorecards]
+
+    def _score_many(self, messages: Iterable[str]) -> Iterator[Number]:
+        """Preprocess and score each message with `self._score`, yielding each
+        score in order."""
+        preprocess = self.__preprocess
+        score = self._score
+        for message in messages:
+            yield score(preprocess(message))
+
+    def stream(self, messages: Iterable[str]) -> Iterator[bool]:
+        """Determines whether each of many texts is or is not Toki Pona,
+        yielding each result as soon as it is made.
+
+        Messages are read from `messages` one at a time and nothing is kept
+        between them, so any iterable, such as a file read with
+        `sonatoki.utils.read_messages`, is scored in constant memory.
+        """
+        preprocess = self.__preprocess
+        passes = self._passes
+        for message in messages:
+            yield passes(preprocess(message))
+
+    @overload
+    def stream_scorecards(
+        self, messages: Iterable[str], *, compact: Literal[False] = False
+    ) -> Iterator[Scorecard]: ...
+
+    @overload
+    def stream_scorecards(
+        self, messages: Iterable[str], *, compact: Literal[True]
+    ) -> Iterator[CompactScorecard]: ...
+
+    def stream_scorecards(
+        self, messages: Iterable[str], *, compact: bool = False
+    ) -> Iterator[AnyScorecard]:
+        """Same as `stream`, but yields a `Scorecard` for each message.
+
+        If `compact`, each is a `CompactScorecard` instead, which reads the
+        same but takes less memory; prefer it for keeping many scorecards.
+        """
+        preprocess = self.__preprocess
+        is_toki_pona = self._is_toki_pona
+        for message in messages:
+            yield is_toki_pona(preprocess(message), compact)
+
+    @overload
+    def make_scorecard_many(
+        self, messages: Iterable[str], *, compact: Literal[False] = False
+    ) -> List[Scorecard]: ...
+
+    @overload
+    def make_scorecard_many(
+        self, messages: Iterable[str], *, compact: Literal[True]
+    ) -> List[CompactScorecard]: ...
+
+    def make_scorecard_many(
+        self, messages: Iterable[str], *, compact: bool = False
+    ) -> Sequence[AnyScorecard]:
+        """Preprocess each of many messages, then create and return a
+        `Scorecard` for each message, in order. See `stream_scorecards` for
+        `compact`."""
+        return list(self.stream_scorecards(messages, compact=compact))
+
+    @overload
+    def make_scorecards_many(
+        self, messages: Iterable[str], *, compact: Literal[False] = False
+    ) -> List[List[Scorecard]]: ...
+
+    @overload
+    def make_scorecards_many(
+        self, messages: Iterable[str], *, compact: Literal[True]
+    ) -> List[List[CompactScorecard]]: ...
+
+    def make_scorecards_many(
+        self, messages: Iterable[str], *, compact: bool = False
+    ) -> Sequence[Sequence[AnyScorecard]]:
+        """Preprocess each of many messages, then create and return a list with
+        a `Scorecard` for each sentence of each message, in order. See
+        `stream_scorecards` for `compact`."""
+        preprocess = self.__preprocess
+        are_toki_pona = self._are_toki_pona
+
+        results: List[List[Scorecard]] = []
+        for message in messages:
+            message = preprocess(message)
+            results.append(are_toki_pona(message, compact))
+        return results
+
+    def score_batch(self, messages: Iterable[str]) -> ScoreBatch:
+        """Preprocess and score each of many messages, returning each score,
+        how many tokens it was made from, and whether it passed, as columns
+        in a `ScoreBatch`.
+
+        Scores are the same as `score_many`'s, but are stored as doubles
+        which can be handed to NumPy without copying.
+        """
+        preprocess = self.__preprocess
+        tokenize = self.__word_tokenize
+        verdict = self.__verdict
+        score_verdicts = self.__score_verdicts
+        scoring_filters = self.__scoring_filters
+        passing_score = self.__passing_score
+
+        batch = ScoreBatch()
+        for message in messages:
+            verdicts = list(map(verdict, tokenize(preprocess(message))))
+            cleaned = len(verdicts) - [v.cleaned for v in verdicts].count("")
+            score = score_verdicts(iter(verdicts), scoring_filters)
+            if score is None:
+                score = self.__empty_score()
+            batch.append(score, len(verdicts), cleaned, score >= passing_score)
+        return batch
+
+    def score_many(self, messages: Iterable[str]) -> List[Number]:
+        """Preprocess and score each of many messages, returning the scores in
+        the same order as the input."""
+        return list(self._score_many(messages))
+
+    def is_toki_pona_many(self, messages: Iterable[str]) -> List[bool]:
+        """Determines whether each of many texts is or is not Toki Pona,
+        returning the results in the same order as the input.
+
+        Prefer this over calling `is_toki_pona` in a loop when you have
+        many messages at once, such as when building a corpus.
+        """
+        return list(self.stream(messages))
+
+    def _filter_caches(self) -> Dict[type, Any]:
+        filters: Set[Type[Filter]] = set(self.__ignoring_filters)
+        filters.update(self.__scoring_filters)
+        prereq = getattr(self.__scorer, "prereq", None)
+        if prereq is not None:
+            filters.add(prereq)
+
+        caches: Dict[type, Any] = {}
+        for f in filters:
+            caches.update(filter_caches(f))
+        return caches
+
+    def cache_info(self) -> Dict[type, CacheInfo]:
+        """Report the hits, misses, and size of each filter cache used by this
+        `Ilo`, keyed by the filter class which owns the cache.
+
+        Filter caches are shared by every `Ilo` using the same filters,
+        so these numbers include work done by other `Ilo`s.
+        """
+        return {
+            klass: CacheInfo(*cache.cache_info())
+            for klass, cache in self._filter_caches().items()
+        }
+
+    def verdict_cache_info(self) -> CacheInfo:
+        """Report the hits, misses, and size of this `Ilo`'s own cache of
+        token verdicts. See `verdict`."""
+        return CacheInfo(*self.__verdict.cache_info())
+
+    def clear_caches(self):
+        """Empty every filter cache used by this `Ilo`, releasing the memory
+        held by remembered tokens.
+
+        Filter caches are shared by every `Ilo` using the same filters,
+        so this also clears them for other `Ilo`s. This `Ilo`'s cache of
+        verdicts is cleared too.
+        """
+        self.__verdict.cache_clear()
+        for cache in self._filter_caches().values():
+            cache.cache_clear()
+
+    def _stream_parallel(
+        self,
+        method: str,
+        messages: Iterable[str],
+        workers: Optional[int],
+        chunksize: int,
+        **kwargs: Any,
+    ) -> Iterator[object]:
+        # bound how far the pool reads ahead of whoever is consuming results
+        ahead = 2 * (workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self,),
+        ) as executor:
+            run = partial(_run_in_worker, method, **kwargs)
+            pending: Deque["Future[List[object]]"] = deque()
+            for chunk in batched(messages, chunksize):
+                pending.append(executor.submit(run, chunk))
+                if len(pending) > ahead:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+
+    def _map_parallel(
+        self,
+        method: str,
+        messages: Iterable[str],
+        workers: Optional[int],
+        chunksize: int,
+        **kwargs: Any,
+    ) -> List[object]:
+        return list(
+            self._stream_parallel(method, messages, workers, chunksize, **kwargs)
+        )
+
+    def map_parallel(
+        self,
+        messages: Iterable[str],
+        workers: Optional[int] = None,
+        chunksize: int = 1024,
+    ) -> List[bool]:
+        """Determines whether each of many texts is or is not Toki Pona, using
+        a pool of `workers` processes (default: one per CPU). Results are
+        returned in the same order as the input.
+
+        Each worker receives a pickled copy of this `Ilo`, then scores
+        `chunksize` messages at a time with `is_toki_pona_many`. Filters
+        and scorers built by factories such as `Or` or `Len` are pickled
+        as the call which built them, so each worker rebuilds an
+        identical pipeline.
+        """
+        return self._map_parallel(  # type: ignore [return-value]
+            "is_toki_pona_many", messages, workers, chunksize
+        )
+
+    def stream_parallel(
+        self,
+        messages: Iterable[str],
+        workers: Optional[int] = None,
+        chunksize: int = 1024,
+    ) -> Iterator[bool]:
+        """Same as `map_parallel`, but yields each result in order as soon as its
+        chunk is done. At most two chunks per worker are read from `messages`
+        ahead of the results consumed, so memory use stays bounded."""
+        return self._stream_parallel(  # type: ignore [return-value]
+            "is_toki_pona_many", messages, workers, chunksize
+        )
+
+    @overload
+    def make_scorecard_parallel(
+        self,
+        messages: Iterable[str],
+        workers: Optional[int] = None,
+        chunksize: int = 1024,
+        *,
+        compact: Literal[False] = False,
+    ) -> List[Scorecard]: ...
+
+    @overload
+    def make_scorecard_parallel(
+        self,
+        messages: Iterable[str],
+        workers: Optional[int] = None,
+        chunksize: int = 1024,
+        *,
+        compact: Literal[True],
+    ) -> List[CompactScorecard]: ...
+
+    def make_scorecard_parallel(
+        self,
+        messages: Iterable[str],
+        workers: Optional[int] = None,
+        chunksize: int = 1024,
+        *,
+        compact: bool = False,
+    ) -> Sequence[AnyScorecard]:
+        """Same as `map_parallel`, but returns a `Scorecard` for each
+        message. See `stream_scorecards` for `compact`."""
+        return self._map_parallel(  # type: ignore [return-value]
+            "make_scorecard_many", messages, workers, chunksize, compact=compact
+        )
@@ -1,7 +1,28 @@
 # STL
-from typing import Dict, List, Union, Literal, TypedDict
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Set,
+    Dict,
+    List,
+    Tuple,
+    Union,
+    Literal,
+    Mapping,
+    Iterator,
+    Optional,
+    TypedDict,
+    NamedTuple,
+)
+
+if TYPE_CHECKING:
+    # PDM
+    import numpy
 
 Number = Union[int, float]
+Span = Tuple[int, int]
+"""The start and end of a slice of a string, as in `s[start:end]`."""
 
 
 # TODO: scorecard kinda sucks as a name
@@ -13,6 +34,165 @@ class Scorecard(TypedDict):
     score: Number
 
 
+class CompactScorecard(Mapping[str, Any]):
+    """The same fields as a `Scorecard`, in a slotted object rather than a dict,
+    for holding many scorecards at once.
+
+    Fields may be read and the score replaced as with a `Scorecard`, as
+    in `card["score"]`, and a `CompactScorecard` equals a `Scorecard` with
+    the same fields. Use `dict(card)` for an actual `Scorecard`.
+
+    Where they are equal, `tokenized`, `filtered`, and `cleaned` may be
+    the same list, so they must not be changed in place.
+    """
+
+    __slots__ = ("text", "tokenized", "filtered", "cleaned", "score")
+
+    text: str
+    tokenized: List[str]
+    filtered: List[str]
+    cleaned: List[str]
+    score: Number
+
+    def __init__(
+        self,
+        text: str,
+        tokenized: List[str],
+        filtered: List[str],
+        cleaned: List[str],
+        score: Number,
+    ):
+        self.text = text
+        self.tokenized = tokenized
+        self.filtered = filtered
+        self.cleaned = cleaned
+        self.score = score
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+AnyScorecard = Union[Scorecard, CompactScorecard]
+
+
+class ScoreBatch:
+    """The scores of many messages, kept as columns rather than as one
+    `Scorecard` per message.
+
+    `scores` holds each message's score as a double, `tokens` and
+    `cleaned` how many tokens it had before filtering and after cleaning,
+    and `passed` a bitmask of whether it passed, where message `i` is bit
+    `i % 8` of byte `i // 8`. Each is a buffer, so it can be read by
+    `numpy.frombuffer` or `memoryview` without copying; see `to_numpy`.
+    """
+
+    scores: "array[float]"
+    tokens: "array[int]"
+    cleaned: "array[int]"
+    passed: bytearray
+
+    def __init__(self):
+        self.scores = array("d")
+        self.tokens = array("q")
+        self.cleaned = array("q")
+        self.passed = bytearray()
+
+    def append(self, score: Number, tokens: int, cleaned: int, passed: bool):
+        i = len(self.scores)
+        if not i % 8:
+            self.passed.append(0)
+        if passed:
+            self.passed[i >> 3] |= 1 << (i & 7)
+        self.scores.append(score)
+        self.tokens.append(tokens)
+        self.cleaned.append(cleaned)
+
+    def passes(self, i: int) -> bool:
+        """Whether message `i` passed."""
+        if not 0 <= i < len(self.scores):
+            raise IndexError(i)
+        return bool(self.passed[i >> 3] >> (i & 7) & 1)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def to_numpy(self) -> Dict[str, "numpy.ndarray"]:
+        """Each column as a NumPy array, sharing memory with this batch except
+        for `passed`, which is unpacked to one bool per message.
+
+        NumPy is not a dependency of this library, so it must be
+        installed to use this. While the arrays sharing memory exist,
+        nothing can be appended to this batch.
+        """
+        # PDM
+        import numpy
+
+        passed = numpy.unpackbits(
+            numpy.frombuffer(self.passed, dtype=numpy.uint8),
+            count=len(self),
+            bitorder="little",
+        )
+        return {
+            "scores": numpy.frombuffer(self.scores, dtype=numpy.float64),
+            "tokens": numpy.frombuffer(self.tokens, dtype=numpy.int64),
+            "cleaned": numpy.frombuffer(self.cleaned, dtype=numpy.int64),
+            "passed": passed.astype(bool),
+        }
+
+
+class CacheInfo(NamedTuple):
+    """Statistics for one filter's cache of verdicts."""
+
+    hits: int
+    misses: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class Timing(NamedTuple):
+    """Cumulative statistics for one stage or component of an `Ilo`."""
+
+    calls: int
+    seconds: float
+
+
+class Verdict(NamedTuple):
+    """Everything an `Ilo` decides about one token on its own."""
+
+    ignored: bool
+    """Whether an ignoring filter matched the token."""
+    cleaned: str
+    """The token after cleaning, or "" if it was ignored."""
+    index: int
+    """The index of the first scoring filter matching the cleaned token, or -1
+    if none did."""
+
+
+class Edit(NamedTuple):
+    """One replacement a preprocessor makes in the message it is given."""
+
+    start: int
+    end: int
+    text: str
+    """What replaces `msg[start:end]`."""
+
+
 LinkuUsageDate = Union[
     Literal["2020-04"],
     Literal["2021-10"],
@@ -62,3 +242,21 @@ class LinkuWord(TypedDict):
     image: str
     svg: str
     translations: Dict[str, str]
+
+
+class LexiconEntry(TypedDict):
+    """The fields of a `LinkuWord` which are kept in the packaged lexicon."""
+
+    word: str
+    book: str
+    usage_category: LinkuUsageCategory
+    usage: Dict[LinkuUsageDate, int]
+
+
+class LinkuIndex(TypedDict):
+    """Every word in Linku, grouped by the fields which `words_by_tag` and
+    `words_by_usage` search."""
+
+    words: Set[str]
+    tags: Dict[str, Dict[str, Set[str]]]  # tag -> value -> words
+    usage: Dict[str, Dict[str, int]]  # date -> word -> usage
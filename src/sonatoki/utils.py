@@ -1,12 +1,42 @@
 # STL
+import io
+import gzip
+import json
+import time
+import copyreg
 import itertools
-from typing import Set, List, Tuple, TypeVar, Iterable
+from os import PathLike
+from abc import ABCMeta
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Set,
+    Dict,
+    List,
+    Tuple,
+    Union,
+    TextIO,
+    Generic,
+    TypeVar,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+)
 
 # LOCAL
+from sonatoki.types import Timing
 from sonatoki.Cleaners import Lowercase, ConsecutiveDuplicates
 
+if TYPE_CHECKING:
+    # PDM
+    import regex
+
 TO_ESCAPE = ["\\", "^", "[", "]", "-"]
 
+# non-ascii characters which `re.IGNORECASE` matches with ascii letters
+CASE_ALIASES = {"i": "\u0130\u0131", "k": "\u212a", "s": "\u017f"}
+
 T = TypeVar("T")
 
 
@@ -20,6 +50,209 @@ def prep_dictionary(words: Iterable[str]) -> Set[str]:
     return out
 
 
+def batched(iterable: Iterable[T], n: int) -> Iterator[List[T]]:
+    """Split an iterable into lists of length `n`; the last may be shorter.
+
+    Equivalent to `itertools.batched`, which is new in 3.12.
+    """
+    if n < 1:
+        raise ValueError("n must be at least one")
+    it = iter(iterable)
+    while batch := list(itertools.islice(it, n)):
+        yield batch
+
+
+def parse_messages(
+    lines: Iterable[str], field: Optional[str] = None, name: str = "<input>"
+) -> Iterator[str]:
+    """Yield the message in each line, without its line ending.
+
+    If `field` is given, each line is instead a JSON object with the
+    message under that key, as in a JSONL export, and blank lines are
+    skipped. A line which is not such an object raises `ValueError`,
+    naming it as `name:lineno`.
+    """
+    for lineno, line in enumerate(lines, 1):
+        line = line[:-2] if line.endswith("\r\n") else line.rstrip("\n")
+        if field is None:
+            yield line
+        elif line.strip():
+            try:
+                message = json.loads(line)[field]
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{name}:{lineno}: not JSON: {e}") from e
+            except (KeyError, TypeError) as e:
+                raise ValueError(f"{name}:{lineno}: no {field!r} field") from e
+            yield message
+
+
+def read_messages(
+    path: Union[str, "PathLike[str]"],
+    field: Optional[str] = None,
+    encoding: str = "utf-8",
+    buffer_size: int = 2**20,
+) -> Iterator[str]:
+    """Yield each message in a file of one message per line, without reading
+    more of the file than `buffer_size` bytes ahead. See `parse_messages`
+    for `field`.
+
+    Files ending in `.gz` are decompressed as they are read, and
+    `buffer_size` counts decompressed bytes.
+    """
+    # only "\n" ends a line, so a stray "\r" in a message is kept
+    if str(path).endswith(".gz"):
+        # read ahead `buffer_size` bytes of the decompressed file
+        file: TextIO = io.TextIOWrapper(
+            io.BufferedReader(gzip.open(path, "rb"), buffer_size),  # type: ignore [arg-type]
+            encoding=encoding,
+            newline="\n",
+        )
+    else:
+        file = open(path, encoding=encoding, newline="\n", buffering=buffer_size)
+
+    with file:
+        yield from parse_messages(file, field, str(path))
+
+
+class Lazy(Generic[T]):
+    """A class attribute which is built the first time it is read, rather than
+    when its class is defined.
+
+    Meant for attributes which are slow to build but rarely used, such
+    as the patterns of reference implementations. The built value
+    replaces the `Lazy` on its class, so later reads are ordinary
+    attribute reads.
+    """
+
+    def __init__(self, build: Callable[[], T]):
+        self.build = build
+
+    def __set_name__(self, owner: type, name: str):
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, obj: object, objtype: Optional[type] = None) -> T:
+        value = self.build()
+        setattr(self.owner, self.name, value)
+        return value
+
+
+StatsKey = Union[str, type]
+
+
+class Stats:
+    """Cumulative calls and seconds spent in each stage of an `Ilo`, and in
+    each preprocessor, filter and cleaner within those stages.
+
+    Stages are keyed by name: "preprocess", "sent_tokenize",
+    "word_tokenize", "filter", "clean", "classify", and "score".
+    Components are keyed by their class, and their time also counts
+    towards their stage. If given, `callback` is called with the key and
+    seconds of every timed call as it finishes.
+
+    `Ilo.is_toki_pona` and `Ilo.score` judge each token as it is scored,
+    so there the "filter", "clean", and "classify" stages count towards
+    "score" too.
+
+    An `Ilo` only records into a `Stats` it was made with, and only then
+    pays for timing at all.
+    """
+
+    calls: Dict[StatsKey, int]
+    seconds: Dict[StatsKey, float]
+    callback: Optional[Callable[[StatsKey, float], object]]
+
+    def __init__(self, callback: Optional[Callable[[StatsKey, float], object]] = None):
+        self.calls = {}
+        self.seconds = {}
+        self.callback = callback
+
+    def __getitem__(self, key: StatsKey) -> Timing:
+        return Timing(self.calls.get(key, 0), self.seconds.get(key, 0.0))
+
+    def report(self) -> Dict[StatsKey, Timing]:
+        """Every stage and component recorded so far, in order of first
+        use."""
+        return {key: self[key] for key in self.calls}
+
+    def record(self, key: StatsKey, seconds: float):
+        self.calls[key] = self.calls.get(key, 0) + 1
+        self.seconds[key] = self.seconds.get(key, 0.0) + seconds
+        if self.callback is not None:
+            self.callback(key, seconds)
+
+    def timed(self, key: StatsKey, func: Callable[..., T]) -> Callable[..., T]:
+        """Wrap `func` so that every call to it is recorded under `key`."""
+        record = self.record
+        clock = time.perf_counter
+
+        def timed(*args: Any) -> T:
+            start = clock()
+            try:
+                return func(*args)
+            finally:
+                record(key, clock() - start)
+
+        return timed
+
+    def reset(self):
+        self.calls.clear()
+        self.seconds.clear()
+
+
+def compile_regex1(pattern: str, flags: int = 0) -> "regex.Pattern[str]":
+    """Compile a pattern with VERSION1 of the `regex` library.
+
+    `regex` is imported here rather than at the top of any module
+    because importing it is slow, and only reference implementations
+    use it.
+    """
+    # PDM
+    import regex
+
+    return regex.compile(pattern, flags | regex.VERSION1)
+
+
+def compile_pattern(cls: type, compile: Callable[[str], Any]) -> None:
+    """If `cls` itself sets `pattern` to a str, replace it with the pattern
+    `compile` makes of it.
+
+    Regex classes call methods on their compiled `pattern`, so their
+    `__init_subclass__` calls this to let subclasses still give it as a
+    str.
+    """
+    pattern = vars(cls).get("pattern")
+    if isinstance(pattern, str):
+        setattr(cls, "pattern", compile(pattern))
+
+
+def compile_automaton(
+    transitions: Dict[str, Dict[str, str]],
+    accepting: Set[str],
+) -> Tuple[List[Dict[str, int]], Tuple[bool, ...]]:
+    """Compile a case-insensitive deterministic finite automaton into lookup
+    tables.
+
+    `transitions` maps each state's name to a map of the characters it
+    accepts (as one string per target) to the name of the next state.
+    The first state is the start state. Characters missing from a
+    state's map reject the input.
+
+    Returns one map per state from each character, in any case, to the
+    index of the next state, and whether each state accepts.
+    """
+    names = list(transitions)
+    steps: List[Dict[str, int]] = []
+    for name in names:
+        step: Dict[str, int] = {}
+        for chars, target in transitions[name].items():
+            for char in chars:
+                for variant in (char, char.upper(), *CASE_ALIASES.get(char, "")):
+                    step[variant] = names.index(target)
+        steps.append(step)
+    return steps, tuple(name in accepting for name in names)
+
+
 def regex_escape(s: str) -> str:
     """Escape all characters which must be escaped when embedded in a character
     class."""
@@ -81,3 +314,37 @@ def overlapping_ntuples(iterable: Iterable[T], n: int) -> Iterable[Tuple[T, ...]
 
     # ends when any iter is empty; all groups will be same size
     return zip(*teed)
+
+
+class FactoryMeta(ABCMeta):
+    """Metaclass for classes which may be built at runtime by a factory, such
+    as `Or`, `Len`, or `Soften`.
+
+    Classes made inside a function cannot be found by name, so `pickle`
+    cannot serialize them by reference. A factory built class instead
+    records the call that made it in `_factory` with `made_by`, and is
+    pickled as that call, so a worker process which unpickles it builds
+    an identical class for itself. Classes without a `_factory` are
+    pickled by reference as usual.
+    """
+
+
+Factory = Tuple[Callable[..., Any], Tuple[Any, ...]]
+C = TypeVar("C", bound=type)
+
+
+def made_by(cls: C, factory: Callable[..., Any], *args: Any) -> C:
+    """Record that `cls` was made by calling `factory(*args)`."""
+    cls._factory = (factory, args)  # type: ignore [attr-defined]
+    return cls
+
+
+def _reduce_factory_class(cls: type) -> Union[str, Factory]:
+    # only the class a factory made may be remade with its factory, not its subclasses
+    factory: Union[Factory, None] = cls.__dict__.get("_factory")
+    if factory is None:
+        return cls.__qualname__
+    return factory
+
+
+copyreg.pickle(FactoryMeta, _reduce_factory_class)  # type: ignore [arg-type]
@@ -1,5 +1,8 @@
 # STL
+import pickle
 import string
+import itertools
+from typing import List, Type
 
 # PDM
 import pytest
@@ -8,10 +11,12 @@ from hypothesis import given, example
 
 # LOCAL
 from sonatoki.Filters import (
+    FILTER_CACHE_SIZE,
     Or,
     And,
     Len,
     Not,
+    Filter,
     NimiPu,
     PuName,
     Numeric,
@@ -19,12 +24,17 @@ from sonatoki.Filters import (
     Alphabetic,
     NimiKuLili,
     NimiKuSuli,
+    ProperName,
+    SyllabicRe,
     Phonotactic,
     Punctuation,
+    RegexFilter,
     AlphabeticRe,
     LongSyllabic,
     MemberFilter,
+    Regex1Filter,
     NimiLinkuCore,
+    PhonotacticRe,
     PunctuationRe,
     LongAlphabetic,
     PunctuationRe1,
@@ -34,12 +44,15 @@ from sonatoki.Filters import (
     NimiLinkuObscure,
     NimiLinkuSandbox,
     NimiLinkuUncommon,
+    compile_filter,
+    compile_classifier,
+    set_filter_cache_size,
 )
 from sonatoki.Cleaners import Lowercase, ConsecutiveDuplicates
 from sonatoki.constants import FALSE_POS_SYLLABIC, words_by_tag
 
 # FILESYSTEM
-from .test_utils import PROPER_NAME_RE
+from .test_utils import PROPER_NAME_RE, token_strategy
 
 
 @given(st.sampled_from(list(words_by_tag("book", "pu"))))
@@ -121,6 +134,29 @@ def test_LongSyllabic(s: str):
     assert res == len_ok
 
 
+@pytest.mark.parametrize(
+    "filter, reference", [(Syllabic, SyllabicRe), (Phonotactic, PhonotacticRe)]
+)
+def test_automata_match_reference(filter: Type[Filter], reference: Type[Filter]):
+    # every short word over one letter of each kind the automata distinguish
+    letters = "aeiounmkjtwxAKı\u212a\n"
+    for length in range(5):
+        for chars in itertools.product(letters, repeat=length):
+            token = "".join(chars)
+            assert filter.filter(token) == reference.filter(token), repr(token)
+
+    # and every character in the basic multilingual plane
+    for i in range(0x10000):
+        for token in (chr(i), f"an{chr(i)}"):
+            assert filter.filter(token) == reference.filter(token), repr(token)
+
+
+@given(st.text())
+def test_automata_match_reference_text(s: str):
+    assert Syllabic.filter(s) == SyllabicRe.filter(s)
+    assert Phonotactic.filter(s) == PhonotacticRe.filter(s)
+
+
 @given(st.from_regex(AlphabeticRe.pattern, fullmatch=True))
 @example("muems")
 @example("mpptp")
@@ -353,3 +389,116 @@ def test_SubTokensFromMemberFilter(s: str):
     # if kin becomes core, needs to be corrected
 
     assert not NimiAlaFilter.filter(s)
+
+
+@pytest.mark.parametrize(
+    "filter",
+    [
+        NimiPu,
+        Syllabic,
+        LongSyllabic,
+        Len(Or(NimiPu, NimiKuSuli), max=15),
+        Or(Syllabic, Numeric),
+        And(Syllabic, Not(FalsePosSyllabic(add={"kijetesantakalu"}))),
+        NimiLinkuCore(sub=NimiPu.tokens),
+        Not(Alphabetic),
+    ],
+)
+def test_filters_survive_pickling(filter: Type[Filter]):
+    unpickled = pickle.loads(pickle.dumps(filter))
+    for token in ["toki", "anime", "kijetesantakalu", "MUMUMU", "42", "pona.", "w"]:
+        assert unpickled.filter(token) == filter.filter(token), token
+
+
+def test_filter_cache_is_bounded():
+    try:
+        set_filter_cache_size(4)
+        for token in ["toki", "pona", "li", "mute", "a", "e"]:
+            assert Syllabic.filter(token)
+        assert Syllabic.filter.cache_info().currsize == 4
+        assert Syllabic.filter.cache_info().maxsize == 4
+
+        # factory filters built after resizing get the new size too
+        assert Or(Syllabic, Numeric).filter.cache_info().maxsize == 4
+    finally:
+        set_filter_cache_size(FILTER_CACHE_SIZE)
+    assert Syllabic.filter.cache_info().maxsize == FILTER_CACHE_SIZE
+    assert Syllabic.filter("toki")
+
+
+COMPILABLE = [
+    NimiPu,
+    Numeric,
+    Alphabetic,
+    AlphabeticRe,
+    LongSyllabic,
+    Not(And(Not(Syllabic), Alphabetic)),
+    Len(And(Len(Or(NimiPu, NimiKuSuli), max=15), Alphabetic), min=2, max=10),
+    Or(Syllabic, Numeric, NimiPu, NimiKuLili),
+    Or(AlphabeticRe, PhonotacticRe, SyllabicRe, Len(ProperName, min=2)),
+    And(LongAlphabetic, Not(FalsePosSyllabic), Not(NimiPu)),
+    And(NimiLinkuCore, NimiPu, Not(Or(NimiKuSuli, Phonotactic))),
+]
+
+
+@given(st.lists(token_strategy | st.text(min_size=1), max_size=10))
+@example(["", "toki", "TOKI", "Toki", "42", "kijetesantakalu", "ⅷ"])
+def test_compile_filter(tokens: List[str]):
+    tokens = [t for t in tokens if t]  # ProperName can't handle empty tokens
+    for filter in COMPILABLE:
+        compiled = compile_filter(filter)
+        for token in tokens:
+            assert compiled(token) == filter.filter(token), (filter, token)
+
+    anything = compile_filter(*COMPILABLE)
+    nothing = compile_filter()
+    for token in tokens:
+        assert anything(token) == any(f.filter(token) for f in COMPILABLE)
+        assert not nothing(token)
+
+
+CLASSIFIABLE = [
+    [],
+    [NimiPu],
+    [AlphabeticRe, SyllabicRe, PhonotacticRe],
+    [Len(NimiKuSuli, max=4), NimiKuLili, Len(NimiPu, min=3), AlphabeticRe],
+    [Syllabic, NimiPu, SyllabicRe, Len(Or(NimiPu, NimiKuSuli), max=5), Numeric],
+    COMPILABLE,
+]
+
+
+@given(st.lists(token_strategy | st.text(min_size=1), max_size=10))
+@example(["toki", "TOKI", "Toki", "tokii", "42", "kijetesantakalu", "anpa", "x"])
+def test_compile_classifier(tokens: List[str]):
+    tokens = [t for t in tokens if t]
+    for filters in CLASSIFIABLE:
+        classify = compile_classifier(filters)
+        for token in tokens:
+            expected = next((i for i, f in enumerate(filters) if f.filter(token)), -1)
+            assert classify(token) == expected, (filters, token)
+
+
+def test_regex_filters_accept_str_patterns():
+    class XYZ(RegexFilter):
+        pattern = r"[xyz]+"
+
+    class XYZ1(Regex1Filter):
+        pattern = r"[xyz]+"
+
+    for filter in (XYZ, XYZ1):
+        assert filter.filter("xyzzy")
+        assert not filter.filter("toki")
+
+
+def test_compile_str_patterns():
+    class XYZ(RegexFilter):
+        pattern = r"[xyz]+"
+
+    class Late(RegexFilter): ...
+
+    Late.pattern = r"[xyz]+"  # type: ignore [assignment]
+
+    for filter in (XYZ, Late):
+        assert compile_filter(filter)("xyzzy")
+        assert not compile_filter(filter)("toki")
+        assert compile_classifier([NimiPu, filter])("xyzzy") == 1
@@ -1,12 +1,32 @@
 # STL
-from typing import List, Tuple
+import sys
+import json
+import pickle
+import itertools
+import subprocess
+from typing import List, Type, Tuple
+from pathlib import Path
 
 # PDM
 import pytest
 
 # LOCAL
 from sonatoki.ilo import Ilo
-from sonatoki.Configs import LazyConfig, PrefConfig, CorpusConfig
+from sonatoki.types import CompactScorecard
+from sonatoki.utils import Stats
+from sonatoki.Configs import IloConfig, LazyConfig, PrefConfig, CorpusConfig
+from sonatoki.Filters import FILTER_CACHE_SIZE, set_filter_cache_size
+from sonatoki.Scorers import (
+    Scorer,
+    SentAvg,
+    SentNoOp,
+    SentenceScorer,
+    SentWeightedAvg,
+)
+
+# FILESYSTEM
+from .test_scorers import OVERRIDDEN
+from .test_tokenize import LowerSentTokenizer
 
 
 @pytest.fixture
@@ -313,3 +333,297 @@ def test_corpus_ignorable_doesnt_change_score(corpus_ilo: Ilo, pair: Tuple[str,
     score_with = corpus_ilo.make_scorecard(with_ignorable)["score"]
     score_without = corpus_ilo.make_scorecard(without_ignorable)["score"]
     assert score_with == score_without
+
+
+@pytest.mark.parametrize("config", [PrefConfig, LazyConfig, CorpusConfig])
+def test_many_matches_single(config: IloConfig):
+    ilo = Ilo(**config)
+    texts = KNOWN_GOOD + KNOWN_BAD + FALSE_NEGATIVES + FALSE_POSITIVES
+
+    assert ilo.is_toki_pona_many(texts) == [ilo.is_toki_pona(t) for t in texts]
+    # deciding early must not change any decision
+    cards = ilo.make_scorecard_many(texts + EMPTY)
+    passing = [card["score"] >= config["passing_score"] for card in cards]
+    assert ilo.is_toki_pona_many(texts + EMPTY) == passing
+    assert ilo.score_many(texts) == [ilo.make_scorecard(t)["score"] for t in texts]
+    for text in texts + EMPTY:
+        cards = ilo.make_scorecards(text)
+        passing = [card["score"] >= config["passing_score"] for card in cards]
+        assert ilo.are_toki_pona(text) == passing
+    assert ilo.make_scorecard_many(texts) == [ilo.make_scorecard(t) for t in texts]
+    assert ilo.make_scorecards_many(texts) == [ilo.make_scorecards(t) for t in texts]
+
+
+@pytest.mark.parametrize("scorer", OVERRIDDEN)
+def test_overridden_score(scorer: Type[Scorer]):
+    ilo = Ilo(**{**PrefConfig, "scorer": scorer})
+    filters = PrefConfig["scoring_filters"]
+    texts = KNOWN_GOOD + KNOWN_BAD
+    for text in texts:
+        card = ilo.make_scorecard(text)
+        assert card["score"] == scorer.score(card["cleaned"], filters), text
+    scores = [ilo.make_scorecard(t)["score"] for t in texts]
+    assert ilo.score_many(texts) == scores
+    passing = [score >= PrefConfig["passing_score"] for score in scores]
+    assert [ilo.is_toki_pona(t) for t in texts] == passing
+
+
+def test_many_accepts_iterables(ilo: Ilo):
+    texts = ["toki pona li pona", "this is english", ""]
+    assert ilo.is_toki_pona_many(iter(texts)) == [True, False, True]
+    assert ilo.is_toki_pona_many(t for t in []) == []
+
+
+@pytest.mark.parametrize("config", [PrefConfig, LazyConfig, CorpusConfig])
+def test_pickled_ilo_matches(config: IloConfig):
+    ilo = Ilo(**config)
+    unpickled = pickle.loads(pickle.dumps(ilo))
+    texts = KNOWN_GOOD + KNOWN_BAD
+    assert unpickled.make_scorecard_many(texts) == ilo.make_scorecard_many(texts)
+
+
+def test_map_parallel(corpus_ilo: Ilo):
+    texts = KNOWN_GOOD + KNOWN_BAD
+    expected = corpus_ilo.is_toki_pona_many(texts)
+    assert corpus_ilo.map_parallel(texts, workers=2, chunksize=7) == expected
+
+    expected_cards = corpus_ilo.make_scorecard_many(texts)
+    result_cards = corpus_ilo.make_scorecard_parallel(texts, workers=2, chunksize=7)
+    assert result_cards == expected_cards
+
+    # more chunks than the pool reads ahead, so results arrive while reading
+    stream = corpus_ilo.stream_parallel(iter(texts), workers=1, chunksize=1)
+    assert list(stream) == expected
+
+
+def test_cli_score(ilo: Ilo):
+    texts = [*KNOWN_GOOD[:5], *KNOWN_BAD[:5]]
+    result = subprocess.run(
+        [sys.executable, "-m", "sonatoki", "score", "--workers", "2"],
+        input="\n".join(texts),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    scores = [json.loads(line)["score"] for line in result.stdout.splitlines()]
+    assert scores == ilo.score_many(texts)
+    assert result.stderr.startswith("scored 10 messages")
+
+
+def test_cli_score_missing_input(tmp_path: Path):
+    missing = str(tmp_path / "missing.txt")
+    result = subprocess.run(
+        [sys.executable, "-m", "sonatoki", "score", missing],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 2
+    assert result.stderr.splitlines()[-1].endswith(
+        f"error: can't open {missing!r}: No such file or directory"
+    )
+    assert "Traceback" not in result.stderr
+
+
+@pytest.mark.parametrize(
+    ["args", "error"],
+    [
+        (["--workers", "-1"], "error: argument --workers: must be at least 0"),
+        (["--chunksize", "0"], "error: argument --chunksize: must be at least 1"),
+        (["--field", "content"], "error: <stdin>:1: no 'content' field"),
+        (
+            ["--field", "content", "--workers", "2"],
+            "error: <stdin>:1: no 'content' field",
+        ),
+        (
+            ["--field", "text"],
+            "error: <stdin>:3: not JSON: Expecting value: line 1 column 1 (char 0)",
+        ),
+    ],
+)
+def test_cli_score_bad_arguments(args: List[str], error: str):
+    result = subprocess.run(
+        [sys.executable, "-m", "sonatoki", "score", *args],
+        input='{"text": "toki"}\n{"text": "pona"}\nmi pona\n',
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 2
+    assert result.stderr.splitlines()[-1].endswith(error)
+    assert "Traceback" not in result.stderr
+
+
+def test_cache_info_and_clear(corpus_ilo: Ilo):
+    corpus_ilo.clear_caches()
+    assert all(info.currsize == 0 for info in corpus_ilo.cache_info().values())
+
+    corpus_ilo.is_toki_pona("mi olin e sina. sina olin e mi")
+    infos = corpus_ilo.cache_info()
+    assert infos
+    assert sum(info.misses for info in infos.values()) > 0
+
+    corpus_ilo.clear_caches()
+    assert all(info.currsize == 0 for info in corpus_ilo.cache_info().values())
+
+
+def test_cache_resized_after_ilo():
+    ilo = Ilo(**PrefConfig)
+    try:
+        set_filter_cache_size(4)
+        ilo.make_scorecard_many([f"mi jo e {i} lipu Jan{i} x{i}" for i in range(50)])
+        infos = ilo.cache_info()
+        assert sum(info.misses for info in infos.values()) > 0
+        assert all(info.currsize <= 4 for info in infos.values())
+
+        ilo.clear_caches()
+        assert all(info.currsize == 0 for info in ilo.cache_info().values())
+    finally:
+        set_filter_cache_size(FILTER_CACHE_SIZE)
+
+
+@pytest.mark.parametrize("config", [PrefConfig, LazyConfig, CorpusConfig])
+def test_verdicts_match_pipeline(config: IloConfig):
+    ilo = Ilo(**config)
+    for text in KNOWN_GOOD + KNOWN_BAD + FALSE_NEGATIVES + FALSE_POSITIVES:
+        message = ilo.preprocess(text)
+        tokenized = ilo.word_tokenize(message)
+        filtered = ilo.filter_tokens(tokenized)
+        cleaned = ilo.clean_tokens(filtered)
+
+        card = ilo.make_scorecard(text)
+        assert card["filtered"] == filtered
+        assert card["cleaned"] == cleaned
+        if cleaned:
+            assert card["score"] == ilo.score_tokens(cleaned)
+
+
+def test_verdict_cache(ilo: Ilo):
+    ilo.clear_caches()
+    ilo.make_scorecard("toki toki toki pona")
+    info = ilo.verdict_cache_info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+    assert ilo.verdict("toki") == (False, "toki", 0)
+
+    unpickled = pickle.loads(pickle.dumps(ilo))
+    assert unpickled.verdict_cache_info().currsize == 0
+    assert unpickled.verdict("toki") == ilo.verdict("toki")
+
+
+@pytest.mark.parametrize("pair", IGNORABLE_PAIRS)
+def test_spans_in_original(ilo: Ilo, pair: Tuple[str, str]):
+    for message in pair:
+        processed, offsets = ilo.preprocess_with_offsets(message)
+        assert processed == ilo.preprocess(message)
+
+        tokens = ilo.word_tokenize(processed)
+        spans = [offsets.original(span) for span in ilo.word_spans(processed)]
+        assert len(spans) == len(tokens)
+        for token, (start, end) in zip(tokens, spans):
+            assert token in message[start:end]
+
+
+def test_sent_tokenizer_without_spans():
+    ilo = Ilo(**{**PrefConfig, "sent_tokenizer": LowerSentTokenizer})
+    message = "TOKI! mi pona."
+    cards = ilo.make_scorecards(message)
+    assert [card["text"] for card in cards] == ["toki!", "mi pona."]
+    assert ilo.are_toki_pona(message) == [True, True]
+
+
+def test_stream(ilo: Ilo):
+    messages = ["toki pona", "hello there", "", "mi moku e kili"]
+    assert list(ilo.stream(messages)) == ilo.is_toki_pona_many(messages)
+    assert list(ilo.stream_scorecards(messages)) == ilo.make_scorecard_many(messages)
+
+    # nothing is read ahead of what is asked for
+    endless = itertools.cycle(messages)
+    assert list(itertools.islice(ilo.stream(endless), 6)) == [
+        *ilo.is_toki_pona_many(messages),
+        *ilo.is_toki_pona_many(messages[:2]),
+    ]
+
+
+@pytest.mark.parametrize("config", [PrefConfig, CorpusConfig, LazyConfig])
+def test_stats(config: IloConfig):
+    recorded: List[Tuple[object, float]] = []
+    stats = Stats(callback=lambda key, seconds: recorded.append((key, seconds)))
+    ilo = Ilo(**config, stats=stats)
+    plain = Ilo(**config)
+    messages = ALL_VALID + EMPTY + [text for pair in IGNORABLE_PAIRS for text in pair]
+
+    assert ilo.is_toki_pona_many(messages) == plain.is_toki_pona_many(messages)
+    assert ilo.make_scorecards_many(messages) == plain.make_scorecards_many(messages)
+    assert plain.stats is None
+
+    report = stats.report()
+    assert report["preprocess"].calls == 2 * len(messages)
+    assert report["word_tokenize"].calls == 2 * len(messages)
+    assert report["sent_tokenize"].calls == len(messages)
+    for stage in ["filter", "clean", "classify", "score"]:
+        assert report[stage].calls > 0
+    # later filters are only tried on tokens earlier filters did not match
+    assert config["ignoring_filters"][0] in report
+    assert config["scoring_filters"][0] in report
+
+    # each component's time is within its stage's time
+    preprocessing = sum(stats[p].seconds for p in config["preprocessors"])
+    assert preprocessing <= report["preprocess"].seconds
+    assert len(recorded) == sum(timing.calls for timing in report.values())
+
+    # copies of the ilo record nothing
+    unpickled = pickle.loads(pickle.dumps(ilo))
+    assert unpickled.stats is None
+    stats.reset()
+    assert stats.report() == {}
+
+
+@pytest.mark.parametrize("sentence_scorer", [SentNoOp, SentAvg, SentWeightedAvg])
+def test_compact_scorecards(sentence_scorer: Type[SentenceScorer]):
+    ilo = Ilo(**CorpusConfig, sentence_scorer=sentence_scorer)
+    texts = ALL_VALID + ["mi toki. this is english. sina pona", "ni li ike a"]
+
+    cards = ilo.make_scorecard_many(texts, compact=True)
+    assert all(isinstance(card, CompactScorecard) for card in cards)
+    assert cards == ilo.make_scorecard_many(texts)
+    assert [dict(card) for card in cards] == ilo.make_scorecard_many(texts)
+    assert ilo.make_scorecards_many(texts, compact=True) == ilo.make_scorecards_many(
+        texts
+    )
+
+    card = cards[0]
+    assert card["score"] == card.score
+    assert sys.getsizeof(card) < sys.getsizeof(dict(card))
+    with pytest.raises(KeyError):
+        card["nimi"]
+
+    parallel = ilo.make_scorecard_parallel(texts, workers=2, compact=True)
+    assert all(isinstance(card, CompactScorecard) for card in parallel)
+    assert parallel == cards
+
+
+@pytest.mark.parametrize("config", [PrefConfig, LazyConfig, CorpusConfig])
+def test_score_batch(config: IloConfig):
+    ilo = Ilo(**config)
+    texts = KNOWN_GOOD + KNOWN_BAD + EMPTY
+    cards = ilo.make_scorecard_many(texts)
+
+    batch = ilo.score_batch(texts)
+    assert len(batch) == len(texts)
+    assert list(batch.scores) == ilo.score_many(texts)
+    assert [batch.passes(i) for i in range(len(batch))] == ilo.is_toki_pona_many(texts)
+    assert list(batch.tokens) == [len(card["tokenized"]) for card in cards]
+    assert list(batch.cleaned) == [len(card["cleaned"]) for card in cards]
+    with pytest.raises(IndexError):
+        batch.passes(len(texts))
+
+
+def test_score_batch_to_numpy(ilo: Ilo):
+    pytest.importorskip("numpy")
+    texts = KNOWN_GOOD + KNOWN_BAD
+    batch = ilo.score_batch(texts)
+    columns = batch.to_numpy()
+    assert columns["scores"].tolist() == list(batch.scores)
+    assert columns["passed"].tolist() == ilo.is_toki_pona_many(texts)
+
+    # the arrays are views of the batch
+    batch.scores[0] = -1.0
+    assert columns["scores"][0] == -1.0
@@ -1,20 +1,28 @@
 # STL
+import re
 from typing import Optional
 
 # PDM
+import emoji
 import pytest
 import hypothesis.strategies as st
 from hypothesis import given, example
 
 # LOCAL
+from sonatoki.Tokenizers import WordTokenizer
 from sonatoki.Preprocessors import (
+    RECOMMENDED_PREPROCESSORS,
     URLs,
+    Emoji,
+    Emails,
+    Offsets,
     Spoilers,
     AllQuotes,
     Backticks,
     Codeblock,
     Reference,
     ArrowQuote,
+    ZeroWidths,
     ColonEmotes,
     DoubleQuotes,
     MarkdownURLs,
@@ -23,9 +31,12 @@ from sonatoki.Preprocessors import (
     DiscordSpecial,
     DiscordChannels,
     DiscordMentions,
+    RegexPreprocessor,
     AngleBracketObject,
+    Regex1Preprocessor,
+    compile_preprocessors,
+    preprocess_with_offsets,
 )
-from src.sonatoki.Preprocessors import Emails
 
 
 def extract_bracket_content(markdown_text: str) -> Optional[str]:
@@ -217,3 +228,122 @@ def test_Reference(s: str):
 def test_ColonEmotes(s: str):
     res = ColonEmotes.process(s).strip()
     assert res == "", (repr(s), repr(res))
+
+
+MESSAGES = [
+    "",
+    "mi moku e kili. sina seme?",
+    "o lukin e ni https://example.com/x [a b](https://b.c) <@1234> mi pona 🙂",
+    "```\nprint('hi')\n``` [[Phatic Phrases]] jan@example.com li toki",
+    "<https://example.com> [[x]] [[y]] http://a.b/c?d=e",
+    "[toki](https://a.b) [pona](http://c.d) 🧑‍🤝‍🧑 <a:emote:123456>",
+]
+
+
+@pytest.mark.parametrize(
+    "preprocessor",
+    [
+        URLs,
+        MarkdownURLs,
+        Emails,
+        Reference,
+        DiscordEmotes,
+        ColonEmotes,
+        DiscordMentions,
+        DiscordChannels,
+        DiscordSpecial,
+        AngleBracketObject,
+        SingleQuotes,
+        DoubleQuotes,
+        Backticks,
+        Codeblock,
+        Spoilers,
+        ArrowQuote,
+        AllQuotes,
+        ZeroWidths,
+    ],
+)
+@given(data=st.data())
+def test_triggers_in_every_match(preprocessor, data: st.DataObject):
+    match = data.draw(st.from_regex(preprocessor.pattern, fullmatch=True))
+    assert any(t in match for t in preprocessor.triggers), repr(match)
+
+
+# the last message only has a URL after MarkdownURLs replaces its link
+@pytest.mark.parametrize("message", MESSAGES + ["htt[p](https://a.b)://example.com"])
+def test_compile_preprocessors(message: str):
+    preprocessors = [ZeroWidths, *RECOMMENDED_PREPROCESSORS, AllQuotes]
+    expected = message
+    for p in preprocessors:
+        expected = p.process(expected)
+    assert compile_preprocessors(preprocessors)(message) == expected
+
+
+EMOJI = list(emoji.EMOJI_DATA)
+
+
+@given(
+    st.lists(
+        st.one_of(
+            st.text(),
+            st.sampled_from(EMOJI),
+            st.sampled_from(EMOJI).map(lambda e: e[:-1]),
+            st.sampled_from(["\u200d", "\ufe0e", "\ufe0f", "\u20e3", "#", "1"]),
+        )
+    ).map("".join)
+)
+@example("mi pona 🙂")
+@example("o lukin e ni: 🧑‍🤝‍🧑 🏳️‍🌈 #️⃣ 1⃣ ☺︎ ❤️")
+@example("jan #\ufe0f\u20e3 li lon")
+@example("\ufe0fa\u200d\ufe0e")
+@example("󱥄󱤧 toki")
+def test_Emoji(s: str):
+    assert Emoji.process(s) == emoji.replace_emoji(s)
+
+
+@pytest.mark.parametrize(
+    "preprocessor",
+    [*RECOMMENDED_PREPROCESSORS, AllQuotes, ZeroWidths],
+)
+@pytest.mark.parametrize("message", MESSAGES)
+def test_edits_match_process(preprocessor, message: str):
+    edits = preprocessor.edits(message)
+    assert Offsets().apply(message, edits) == preprocessor.process(message)
+
+
+def test_preprocess_with_offsets():
+    message = "[toki](https://a.b) 🙂 pona `x` li https://c.d mute"
+    preprocessors = [*RECOMMENDED_PREPROCESSORS, Backticks]
+    processed, offsets = preprocess_with_offsets(preprocessors, message)
+    assert processed == compile_preprocessors(preprocessors)(message)
+
+    originals = [
+        message[slice(*offsets.original(span))]
+        for span in WordTokenizer.spans(processed)
+    ]
+    assert originals == ["[toki](https://a.b)", "pona", "li", "mute"]
+
+
+def test_regex_preprocessors_accept_str_patterns():
+    class Digits(RegexPreprocessor):
+        pattern = r"[0-9]+"
+
+    class Digits1(Regex1Preprocessor):
+        pattern = r"[0-9]+"
+
+    for preprocessor in (Digits, Digits1):
+        assert preprocessor.process("mi 42 a") == "mi   a"
+        assert preprocessor.edits("mi 42 a") == [(3, 5, " ")]
+
+
+
+def test_new_pattern_resets_triggers():
+    class WWW(URLs):
+        pattern = re.compile(r"www\.\S+")
+
+    class Replaced(URLs):
+        replace = ""
+
+    assert WWW.triggers is None
+    assert Replaced.triggers == URLs.triggers
+    assert compile_preprocessors([WWW])("o lukin e www.example.com") == "o lukin e  "
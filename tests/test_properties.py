@@ -22,8 +22,10 @@ from sonatoki.constants import (
     NIMI_PU_SYNONYMS,
     FALSE_POS_SYLLABIC,
     FALSE_POS_ALPHABETIC,
+    linku_index,
     words_by_tag,
     words_by_usage,
+    drop_linku_index,
 )
 
 
@@ -77,3 +79,13 @@ def test_false_pos_properties(s: str):
     res_syllabic = Syllabic.filter(s)
     res_alphabetic = Alphabetic.filter(s)
     assert res_alphabetic and not res_syllabic
+
+
+def test_linku_index_is_built_once():
+    assert linku_index() is linku_index()
+    words = words_by_tag("book", "pu")
+    words.add("not a word")  # callers get a copy
+    assert "not a word" not in words_by_tag("book", "pu")
+
+    drop_linku_index()
+    assert words_by_tag("book", "pu") == words - {"not a word"}
@@ -1,5 +1,6 @@
 # STL
-from typing import List, Type
+import pickle
+from typing import List, Type, Tuple
 
 # PDM
 import pytest
@@ -7,7 +8,9 @@ import hypothesis.strategies as st
 from hypothesis import given, example
 
 # LOCAL
+from sonatoki.types import Number, Verdict
 from sonatoki.Filters import (
+    Pass,
     Filter,
     NimiPu,
     PuName,
@@ -21,9 +24,11 @@ from sonatoki.Filters import (
 )
 from sonatoki.Scorers import (
     Scorer,
+    Soften,
     Voting,
     Scaling,
     PassFail,
+    VotingRef,
     SoftVoting,
     SoftScaling,
     SoftPassFail,
@@ -75,3 +80,155 @@ def test_scoring_empty(scorer: Scorer, filters: List[Type[Filter]], text: List[s
     assert not text
     assert 0 <= score <= 1, (score, filters, text)
     assert score == 1, (score, filters, text)
+
+
+@pytest.mark.parametrize(
+    "scorer", SCORERS + [Soften(Voting(Syllabic, 1)), Voting(Alphabetic, 2)]
+)
+def test_scorers_survive_pickling(scorer: Type[Scorer]):
+    filters = [NimiPu, Syllabic, Alphabetic]
+    tokens = ["mi", "wile", "e", "ni", "anime", "tptp", "xyz", "kala"]
+    unpickled = pickle.loads(pickle.dumps(scorer))
+    assert unpickled.score(tokens, filters) == scorer.score(tokens, filters)
+
+
+class CountScorer(Scorer):
+    @classmethod
+    def score(cls, tokens: List[str], filters: List[Type[Filter]]) -> float:
+        return 1 / (len(tokens) + 1)
+
+
+class SquaredPassFail(PassFail):
+    @classmethod
+    def score(cls, tokens: List[str], filters: List[Type[Filter]]) -> Number:
+        return super().score(tokens, filters) ** 2
+
+
+class SquaredScaling(Scaling):
+    @classmethod
+    def score(cls, tokens: List[str], filters: List[Type[Filter]]) -> Number:
+        return super().score(tokens, filters) ** 2
+
+
+class SquaredVoting(Voting):
+    @classmethod
+    def score(cls, tokens: List[str], filters: List[Type[Filter]]) -> Number:
+        return super().score(tokens, filters) ** 2
+
+
+class HalvedIndicesScaling(Scaling):
+    @classmethod
+    def score(cls, tokens: List[str], filters: List[Type[Filter]]) -> Number:
+        return super().score(tokens, filters) / 2
+
+    @classmethod
+    def score_indices(
+        cls,
+        tokens: List[str],
+        indices: List[int],
+        filters: List[Type[Filter]],
+    ) -> Number:
+        return super().score_indices(tokens, indices, filters) / 2
+
+
+# override only some ways of scoring, which every later way must respect
+OVERRIDDEN = [
+    SquaredPassFail,
+    SquaredScaling,
+    SquaredVoting,
+    Soften(SquaredScaling),
+    HalvedIndicesScaling,
+]
+
+
+@pytest.mark.parametrize(
+    "scorer",
+    SCORERS
+    + OVERRIDDEN
+    + [Voting(Syllabic, 1), Soften(Voting(Alphabetic, 2)), Soften(CountScorer)],
+)
+@given(
+    st.lists(st.sampled_from(FILTERS), min_size=1, unique=True),
+    st.lists(token_strategy, min_size=0, max_size=10),
+)
+def test_score_indices_matches_score(
+    scorer: Type[Scorer], filters: List[Type[Filter]], text: List[str]
+):
+    indices = [
+        next((i for i, f in enumerate(filters) if f.filter(t)), -1) for t in text
+    ]
+    assert scorer.score_indices(text, indices, filters) == scorer.score(text, filters)
+
+
+@pytest.mark.parametrize(
+    "scorer",
+    SCORERS
+    + OVERRIDDEN
+    + [Voting(Syllabic, 1), Soften(Voting(Alphabetic, 2)), Soften(CountScorer)],
+)
+@given(
+    st.integers(min_value=0, max_value=4),
+    st.lists(st.tuples(st.booleans(), st.integers(min_value=-1, max_value=3))),
+    st.sampled_from([0, 0.25, 0.5, 0.6, 0.75, 0.8, 0.9, 1, 1.5]),
+)
+def test_verdicts_match_score_indices(
+    scorer: Type[Scorer],
+    len_filters: int,
+    judged: List[Tuple[bool, int]],
+    passing_score: float,
+):
+    filters = FILTERS[:len_filters]
+    verdicts = [
+        Verdict(not kept, f"t{i}" if kept else "", min(index, len_filters - 1))
+        for i, (kept, index) in enumerate(judged)
+    ]
+    tokens = [v.cleaned for v in verdicts if v.cleaned]
+    indices = [v.index for v in verdicts if v.cleaned]
+
+    passed = scorer.passes(iter(verdicts), len(verdicts), filters, passing_score)
+    scored = scorer.score_verdicts(iter(verdicts), filters)
+    if not tokens:
+        assert passed is None
+        assert scored is None
+    else:
+        score = scorer.score_indices(tokens, indices, filters)
+        assert passed == (score >= passing_score)
+        assert scored == score
+
+
+@pytest.mark.parametrize("scorer", [PassFail, SoftPassFail, Scaling, SoftScaling])
+def test_passes_stops_early(scorer: Type[Scorer]):
+    filters = [NimiPu, Syllabic]
+    verdicts = iter([Verdict(False, "english", -1)] * 100)
+    assert scorer.passes(verdicts, 100, filters, 0.8) is False
+    assert len(list(verdicts)) > 50
+
+
+@pytest.mark.parametrize("prereq", [Pass, Syllabic, Alphabetic])
+@given(
+    st.integers(min_value=0, max_value=3),
+    st.lists(
+        st.tuples(token_strategy, st.integers(min_value=0, max_value=3)),
+        min_size=2,
+        max_size=40,
+    ),
+)
+def test_voting_matches_reference(
+    prereq: Type[Filter], threshold_: int, scored: List[Tuple[str, int]]
+):
+    class Fast(Voting): ...
+
+    class Reference(VotingRef): ...
+
+    for voting in (Fast, Reference):
+        voting.prereq = prereq
+        voting.threshold = threshold_
+
+    tokens = [token for token, _ in scored]
+    fast_scores: List[Number] = [score for _, score in scored]
+    reference_scores = fast_scores[:]
+    max_score = len(tokens) * 3
+    assert Fast.vote(tokens, fast_scores, max_score) == Reference.vote(
+        tokens, reference_scores, max_score
+    )
+    assert fast_scores == reference_scores
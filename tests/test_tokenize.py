@@ -4,15 +4,21 @@ from typing import List, TypedDict
 # PDM
 import yaml
 import pytest
+import hypothesis.strategies as st
+from hypothesis import given, example
 
 # LOCAL
 from sonatoki.Tokenizers import (
+    Tokenizer,
     SentTokenizer,
     WordTokenizer,
+    RegexTokenizer,
+    Regex1Tokenizer,
     SentTokenizerRe,
     WordTokenizerRe,
     SentTokenizerRe1,
     WordTokenizerRe1,
+    tokenize_sentences,
 )
 
 
@@ -112,6 +118,65 @@ def test_WordTokenizer(test: TokenizerTest):
     assert fn_tokenized == test["output"], test["name"]
 
 
+@pytest.mark.parametrize(
+    "test",
+    load_tokenizer_tests("tests/tokenize_cases/tokenize_words_tok.yml")
+    + load_tokenizer_tests("tests/tokenize_cases/tokenize_sentences_tok.yml"),
+)
+@pytest.mark.parametrize("tokenizer", [WordTokenizer, SentTokenizer, SentTokenizerRe])
+def test_spans_match_tokens(tokenizer, test: TokenizerTest):
+    s = test["input"]
+    spans = tokenizer.spans(s)
+    assert [s[start:end] for start, end in spans] == tokenizer.tokenize(s)
+
+
+@pytest.mark.parametrize(
+    "tokenizers",
+    [
+        (SentTokenizer, WordTokenizer),
+        (SentTokenizer, WordTokenizerRe),
+        (SentTokenizerRe, WordTokenizer),
+    ],
+)
+@given(st.text(st.sampled_from("a.-'’!?:… \n󱤀󱦐󱦑é“") | st.characters()))
+@example("wow... a")
+@example("mi.unpa.e.mama.sina o pona! 󱦐󱤀󱦑. é-󱤀")
+def test_tokenize_sentences(tokenizers, s: str):
+    sent_tokenizer, word_tokenizer = tokenizers
+    expected = [
+        (sentence, word_tokenizer.tokenize(sentence))
+        for sentence in sent_tokenizer.tokenize(s)
+    ]
+    assert tokenize_sentences(s, sent_tokenizer, word_tokenizer) == expected
+
+
+class LowerSentTokenizer(Tokenizer):
+    """A sentence tokenizer whose sentences are not slices of its input."""
+
+    @classmethod
+    def tokenize(cls, s: str) -> List[str]:
+        return [sentence.lower() for sentence in SentTokenizer.tokenize(s)]
+
+
+def test_tokenize_sentences_without_spans():
+    s = "TOKI! mi pona."
+    with pytest.raises(ValueError):
+        LowerSentTokenizer.spans(s)
+    assert tokenize_sentences(s, LowerSentTokenizer, WordTokenizer) == [
+        ("toki!", ["toki", "!"]),
+        ("mi pona.", ["mi", "pona", "."]),
+    ]
+
+
+@given(st.text())
+@example("mi\u3000pona-.\u180e󱤀-a")
+@example("a\u200d\u200d󱦐󱥄󱦑 é’s")
+def test_WordTokenizer_keeps_every_char(s: str):
+    tokens = WordTokenizer.tokenize(s)
+    assert "".join(tokens) == "".join(s.split())
+    assert all(token and token.split() == [token] for token in tokens)
+
+
 # @pytest.mark.parametrize(
 #     "test", load_tokenizer_tests("tests/tokenize_cases/tokenize_words_tok.yml")
 # )
@@ -135,3 +200,41 @@ def test_WordTokenizer(test: TokenizerTest):
 #
 #     re1_tokenized = WordTokenizerRe1.tokenize(test["input"])
 #     assert re1_tokenized == test["output"], test["name"]
+
+
+def test_regex_tokenizers_accept_str_patterns():
+    class Commas(RegexTokenizer):
+        pattern = r","
+
+    class Commas1(Regex1Tokenizer):
+        pattern = r","
+
+    for tokenizer in (Commas, Commas1):
+        assert tokenizer.tokenize("mi, sina ,ona") == ["mi", "sina", "ona"]
+
+
+def test_WordTokenizer_subclass_characters():
+    class HashtagTokenizer(WordTokenizer):
+        delimiters = WordTokenizer.delimiters - {"#"}
+
+    assert WordTokenizer.tokenize("mi #pona") == ["mi", "#", "pona"]
+    assert HashtagTokenizer.tokenize("mi #pona") == ["mi", "#pona"]
+    assert HashtagTokenizer.tokenize("mi #pona ☺") == ["mi", "#pona", "☺"]
+    assert WordTokenizer.tokenize("mi #pona ☺") == ["mi", "#", "pona", "☺"]
+
+    # characters outside every class are read as writing, whatever the codes are
+    class ApostropheTokenizer(WordTokenizer):
+        delimiters = {"!", "?", "'"}
+        intra_word_punct = {"'"}
+
+    assert ApostropheTokenizer.tokenize("a.bé c") == ["a.bé", "c"]
+    assert ApostropheTokenizer.tokenize("a.b c") == ["a.b", "c"]
+    assert ApostropheTokenizer.tokenize("a-b'é!") == ["a-b'é", "!"]
+    codes = WordTokenizer.DELIMITER + WordTokenizer.INTRA_WORD + WordTokenizer.GLYPH
+    assert WordTokenizer.tokenize(f"a{codes}b 󱤀") == [f"a{codes}b", "󱤀"]
+
+    class NoIntraWordTokenizer(WordTokenizer):
+        intra_word_punct = set()
+
+    assert NoIntraWordTokenizer.tokenize("ni-li pona") == ["ni", "-", "li", "pona"]
+    assert NoIntraWordTokenizer.tokenize("ni-li é") == ["ni", "-", "li", "é"]
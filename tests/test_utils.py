@@ -1,7 +1,17 @@
+# STL
+import re
+import sys
+import gzip
+import json
+import subprocess
+from pathlib import Path
+
 # PDM
+import pytest
 import hypothesis.strategies as st
 
 # LOCAL
+from sonatoki.utils import Lazy, read_messages
 from sonatoki.Filters import Syllabic, Phonotactic, AlphabeticRe
 from sonatoki.constants import words_by_usage
 
@@ -22,3 +32,53 @@ token_list_strategy = st.lists(
     max_size=10,
     unique=True,
 )
+
+
+def test_lazy_builds_once():
+    calls = []
+
+    class Parent:
+        value = Lazy(lambda: calls.append(1) or "built")
+
+    class Child(Parent): ...
+
+    assert Child.value == "built"
+    assert Parent.value == "built"
+    assert Parent.__dict__["value"] == "built"
+    assert len(calls) == 1
+
+
+def test_slow_imports_are_deferred():
+    code = "import sys, sonatoki.Configs; print('regex' in sys.modules, 'emoji' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.split() == ["False", "False"]
+
+
+def test_read_messages(tmp_path: Path):
+    messages = ["toki pona", "", "a\rb", "mi moku\u2028e kili", "last"]
+
+    text = tmp_path / "messages.txt"
+    text.write_bytes(
+        "\n".join(messages[:3]).encode() + b"\r\n" + "\n".join(messages[3:]).encode()
+    )
+    assert list(read_messages(text, buffer_size=4)) == messages
+
+    jsonl = tmp_path / "messages.jsonl.gz"
+    with gzip.open(jsonl, "wt", encoding="utf-8") as f:
+        for message in messages:
+            f.write(json.dumps({"content": message}) + "\n\n")
+    assert list(read_messages(jsonl, field="content")) == messages
+    assert list(read_messages(jsonl, field="content", buffer_size=4)) == messages
+
+
+def test_read_messages_bad_lines(tmp_path: Path):
+    jsonl = tmp_path / "messages.jsonl"
+    jsonl.write_text('{"content": "toki"}\n\n{"text": "pona"}\n')
+    with pytest.raises(ValueError, match=rf"^{re.escape(str(jsonl))}:3: no 'content'"):
+        list(read_messages(jsonl, field="content"))
+
+    jsonl.write_text('{"content": "toki"}\ntoki\n')
+    with pytest.raises(ValueError, match=rf"^{re.escape(str(jsonl))}:2: not JSON"):
+        list(read_messages(jsonl, field="content"))